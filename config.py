@@ -1,20 +1,35 @@
 # filepath: /data-analysis-tool/data-analysis-tool/config.py
 import os
+import math
+from typing import Final
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-DEFAULT_THRESHOLD = 0.0
-SUPPORTED_FILE_TYPES = ['xlsx', 'xls']
-ANALYSIS_OPTIONS = ['mean', 'median', 'mode']
-RESULTS_SHEET_NAME = 'Analysis Results'
-MAX_ROWS_DISPLAY = 200
+DEFAULT_THRESHOLD: Final = 0.0
+# Immutable constants: frozenset for O(1) membership tests, tuple where UI order matters
+SUPPORTED_FILE_TYPES: Final = frozenset({'xlsx', 'xls'})
+ANALYSIS_OPTIONS: Final = ('mean', 'median', 'mode')
+RESULTS_SHEET_NAME: Final = 'Analysis Results'
+MAX_ROWS_DISPLAY: Final = 200
 
 # Maximum total combinations optimized for fast execution
 # This is the product of all condition variations across all selected columns
 # Set to 10,000 for optimal performance - analysis completes in < 30 seconds
-MAX_TOTAL_COMBINATIONS = 10000
+MAX_TOTAL_COMBINATIONS: Final = 10000
+
+# Precomputed powers of 3 used by the conservative estimate in calculate_max_ranges
+_POW3: Final = tuple(3 ** i for i in range(32))
+
+# Any product above half the limit clamps to the floor of 2 ranges. These let
+# calculate_max_ranges return early without building the (possibly huge) product.
+_POW3_SATURATION: Final = next(k for k, p in enumerate(_POW3) if 2 * p > MAX_TOTAL_COMBINATIONS)
+_LOG_SATURATION: Final = math.log(MAX_TOTAL_COMBINATIONS / 2) + 1e-9
+
+# Session cache for calculate_max_ranges, keyed on (column count, sorted range counts)
+_CACHE: dict = {}
+_CACHE_MAXSIZE: Final = 1024
 
 # PostgreSQL Configuration - Using environment variables for security
 POSTGRESQL_CONFIG = {
@@ -44,23 +59,67 @@ def calculate_max_ranges(selected_columns_count: int, current_column_ranges: dic
     Returns:
         Maximum number of ranges allowed for the current column
     """
+    # Fast paths for the common small-state cases (no cache key needed)
+    if not current_column_ranges:
+        if selected_columns_count == 0:
+            return 100
+        other_columns = selected_columns_count - 1
+        if other_columns <= 0:
+            return 1000
+        if other_columns >= _POW3_SATURATION:
+            return 2
+        return _max_ranges_for_product(_POW3[other_columns])
+    if len(current_column_ranges) == 1 and selected_columns_count != 0:
+        count = next(iter(current_column_ranges.values()))
+        return _max_ranges_for_product(2 if count < 2 else count)
+    
+    # Only the counts matter for the math, so reduce the dict to a hashable key
+    key = (selected_columns_count, tuple(sorted(current_column_ranges.values())))
+    hit = _CACHE.get(key)
+    if hit is not None:
+        return hit
+    
+    if len(_CACHE) >= _CACHE_MAXSIZE:
+        _CACHE.clear()
+    result = _calc_max_ranges(*key)
+    _CACHE[key] = result
+    return result
+
+
+def _max_ranges_for_product(product: int, _max: int = MAX_TOTAL_COMBINATIONS) -> int:
+    """
+    Clamp MAX_TOTAL_COMBINATIONS // product to the 2..1000 range.
+    
+    Callers pass the precomputed product of the other columns' range
+    counts (always >= 1).
+    """
+    max_ranges = _max // product
+    return 2 if max_ranges < 2 else 1000 if max_ranges > 1000 else max_ranges
+
+
+def _calc_max_ranges(selected_columns_count: int, range_counts: tuple = None, *,
+                     _pow3: tuple = _POW3, _pow3_sat: int = _POW3_SATURATION,
+                     _log_sat: float = _LOG_SATURATION) -> int:
+    """
+    Implementation of calculate_max_ranges for the sorted range counts.
+    The module constants are bound as keyword defaults so they are read as locals.
+    """
     if selected_columns_count == 0:
         return 100  # Default high value if no columns selected
     
     # Calculate current product of existing column ranges
-    if current_column_ranges:
-        current_product = 1
-        for count in current_column_ranges.values():
-            current_product *= max(count, 2)  # Assume at least 2 conditions per column
+    if range_counts:
+        # Saturated in log space: the product is guaranteed to clamp to 2
+        if math.fsum(math.log(2 if count < 2 else count) for count in range_counts) > _log_sat:
+            return 2
+        # Assume at least 2 conditions per column; math.prod runs the reduction in C
+        current_product = math.prod(2 if count < 2 else count for count in range_counts) or 1
     else:
         # Conservative estimate: assume other columns have average of 3 conditions each
         other_columns = max(0, selected_columns_count - 1)
-        current_product = 3 ** other_columns if other_columns > 0 else 1
-    
-    # Calculate max ranges for this column
-    if current_product > 0:
-        max_ranges = int(MAX_TOTAL_COMBINATIONS / current_product)
-        # Apply reasonable bounds
-        return max(2, min(max_ranges, 1000))  # Between 2 and 1000
+        if other_columns >= _pow3_sat:
+            return 2
+        # other_columns < _pow3_sat here, which is well inside the table
+        current_product = _pow3[other_columns]
     
-    return 100  # Default fallback
+    return _max_ranges_for_product(current_product)
@@ -1,9 +1,45 @@
+import os
+import warnings
 import pandas as pd
 import numpy as np
 from itertools import combinations, product
+from functools import lru_cache
 from datetime import datetime
-from src.data_processor import fetch_dataframe_from_db
-from src.filter_manager import generate_sql_condition
+from concurrent.futures import ThreadPoolExecutor
+from src.data_processor import fetch_dataframe_from_db, fetch_dataframes_from_db
+from src.filter_manager import generate_sql_conditions_with_metadata
+
+# Numba is optional; without it the per-combination stats fall back to NumPy
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Bottleneck is optional; its NaN-aware reductions back the NumPy stats fallback
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+
+# Worker threads the pandas engine spreads column combinations over
+ANALYSIS_WORKERS = min(8, os.cpu_count() or 1)
+
+# Maximum number of condition sets evaluated by a single batched SQL query
+CONDITION_SETS_PER_QUERY = 500
+
+# Aggregates per (table, id column, result columns, min rows, WHERE clause), reused across runs
+_QUERY_CACHE = {}
+QUERY_CACHE_MAXSIZE = 4096
+
+
+def invalidate_query_cache():
+    """
+    Drop all cached condition-set aggregates.
+    Call this whenever the underlying table is replaced.
+    """
+    _QUERY_CACHE.clear()
 
 
 def analyze_data_combinations_db(table_name, selected_columns, thresholds, id_column, result_columns, 
@@ -26,168 +62,377 @@ def analyze_data_combinations_db(table_name, selected_columns, thresholds, id_co
     """
     results = []
     
+    # Generate SQL conditions once per column. Duplicate conditions and conditions
+    # that can never match (e.g. a range whose start is past its end) are dropped
+    # here, so no condition set containing them is ever sent to the database.
+    column_conditions = {}
+    for col in selected_columns:
+        threshold_config = thresholds[col]
+        col_type = column_types.get(col, 'numeric')
+        
+        # Store as (column, SQL, parenthesized WHERE part, description) tuples, built
+        # once here so the condition-set loop only joins precomputed strings
+        condition_tuples = []
+        seen_conditions = set()
+        for sql_cond, metadata in generate_sql_conditions_with_metadata(col, threshold_config, col_type):
+            if sql_cond in seen_conditions or _condition_is_empty(metadata):
+                continue
+            seen_conditions.add(sql_cond)
+            condition_tuples.append((col, sql_cond, f"({sql_cond})", describe_condition(col, metadata)))
+        
+        column_conditions[col] = condition_tuples
+    
+    # AND only narrows a filter, so a condition matching fewer than min_matching_rows
+    # rows on its own can never be part of a qualifying condition set. Count every
+    # condition in one scan and drop those before any combination is built.
+    all_conditions = [cond for col in selected_columns for cond in column_conditions[col]]
+    if all_conditions:
+        count_query = "SELECT " + ", ".join(
+            f"COUNT(*) FILTER (WHERE {sql_cond}) AS c{i}" for i, (_, sql_cond, _, _) in enumerate(all_conditions)
+        ) + f" FROM {table_name}"
+        counts_df = fetch_dataframe_from_db(count_query)
+        
+        if counts_df is not None and not counts_df.empty:
+            counts = counts_df.iloc[0]
+            keep = {
+                (col, sql_cond)
+                for i, (col, sql_cond, _, _) in enumerate(all_conditions)
+                if counts[f"c{i}"] >= min_matching_rows
+            }
+            for col in selected_columns:
+                column_conditions[col] = [cond for cond in column_conditions[col] if (cond[0], cond[1]) in keep]
+    
+    # Build aggregation SQL parts (the same for every combination)
+    agg_parts = [f"COUNT(*) as matching_rows"]
+    
+    for result_col in result_columns:
+        agg_parts.extend([
+            f"AVG(\"{result_col}\") as {result_col}_mean",
+            f"SUM(\"{result_col}\") as {result_col}_sum",
+            f"COUNT(\"{result_col}\") as {result_col}_count",
+            f"STDDEV(\"{result_col}\") as {result_col}_stddev",
+            f"PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY \"{result_col}\") as {result_col}_median",
+            f"MIN(\"{result_col}\") as {result_col}_min",
+            f"MAX(\"{result_col}\") as {result_col}_max"
+        ])
+    
+    agg_select = ", ".join(agg_parts)
+    result_key = tuple(result_columns)
+    
+    # Initialize all selected columns as blank
+    blank_conditions = dict.fromkeys(selected_columns, "")
+    
     # Generate all combination lengths
     for combo_length in range(1, len(selected_columns) + 1):
         # Get all combinations of columns for this length
         for column_combo in combinations(selected_columns, combo_length):
             
             # For each combination, generate all condition variations
-            condition_variations = []
-            for col in column_combo:
-                threshold_config = thresholds[col]
-                col_type = column_types.get(col, 'numeric')
-                
-                # Generate SQL conditions for this column
-                sql_conditions = generate_sql_condition(col, threshold_config, col_type)
-                
-                # Store as tuples with metadata for later use
-                condition_tuples = []
-                for sql_cond in sql_conditions:
-                    condition_tuples.append((col, sql_cond, threshold_config, col_type))
-                
-                condition_variations.append(condition_tuples)
+            condition_variations = [column_conditions[col] for col in column_combo]
             
-            # Generate all products of condition variations
-            for condition_set in product(*condition_variations):
-                # Build SQL query for this combination
-                where_clauses = []
-                applied_conditions = {}
-                
-                # Initialize all selected columns as blank
-                for col in selected_columns:
-                    applied_conditions[col] = ""
+            # Describe every condition set and canonicalize its WHERE clause; sorting the
+            # clauses makes "(a) AND (b)" and "(b) AND (a)" share one cache entry.
+            # Each set is generated from its per-column condition indexes so bucketed
+            # GROUP BY results can be mapped back to it.
+            entries = []
+            combo_results = {}
+            pending = {}
+            for bucket_key in product(*(range(len(v)) for v in condition_variations)):
+                condition_set = [condition_variations[k][i] for k, i in enumerate(bucket_key)]
+                applied_conditions = blank_conditions.copy()
                 
                 # Build WHERE clause
-                for col, sql_cond, threshold_cfg, col_type in condition_set:
-                    where_clauses.append(f"({sql_cond})")
-                    applied_conditions[col] = generate_condition_description(col, sql_cond, threshold_cfg, col_type)
+                where_clauses = []
+                for col, _, where_part, description in condition_set:
+                    where_clauses.append(where_part)
+                    applied_conditions[col] = description
                 
                 # Combine WHERE clauses
-                where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
+                where_clause = " AND ".join(sorted(where_clauses)) if where_clauses else "1=1"
+                cache_key = (table_name, id_column, result_key, min_matching_rows, where_clause)
+                entries.append((applied_conditions, cache_key))
                 
-                # Build aggregation SQL query
-                agg_parts = [f"COUNT(*) as matching_rows"]
-                
-                for result_col in result_columns:
-                    agg_parts.extend([
-                        f"AVG(\"{result_col}\") as {result_col}_mean",
-                        f"SUM(\"{result_col}\") as {result_col}_sum",
-                        f"COUNT(\"{result_col}\") as {result_col}_count",
-                        f"STDDEV(\"{result_col}\") as {result_col}_stddev",
-                        f"PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY \"{result_col}\") as {result_col}_median",
-                        f"MIN(\"{result_col}\") as {result_col}_min",
-                        f"MAX(\"{result_col}\") as {result_col}_max"
-                    ])
+                # Identical clauses (cached or repeated in this combo) are queried once
+                if cache_key in _QUERY_CACHE:
+                    combo_results[cache_key] = _QUERY_CACHE[cache_key]
+                else:
+                    pending[where_clause] = (cache_key, bucket_key)
+            
+            if pending and all(_conditions_partition_rows(thresholds[col], column_types.get(col, 'numeric'))
+                               for col in column_combo):
+                # Every column's conditions are mutually exclusive, so each row falls in
+                # at most one condition set: label rows with a CASE bucket per column and
+                # let a single GROUP BY compute every set of the combo in one scan.
+                bucket_exprs = []
+                for k, variations in enumerate(condition_variations):
+                    whens = " ".join(f"WHEN {sql_cond} THEN {i}" for i, (_, sql_cond, _, _) in enumerate(variations))
+                    bucket_exprs.append(f"CASE {whens} END AS _b{k}")
                 
-                # Build and execute aggregation query
-                agg_query = f"""
-                    SELECT {', '.join(agg_parts)}
-                    FROM {table_name}
-                    WHERE {where_clause}
+                from_clause = f"""
+                    (SELECT t.*, {', '.join(bucket_exprs)} FROM {table_name} t) t
+                    WHERE {' AND '.join(f"_b{k} IS NOT NULL" for k in range(len(bucket_exprs)))}
                 """
+                group_exprs = [f"_b{k}" for k in range(len(bucket_exprs))]
                 
                 try:
-                    agg_df = fetch_dataframe_from_db(agg_query)
-                    
-                    if agg_df is not None and not agg_df.empty:
-                        matching_rows = int(agg_df.iloc[0]['matching_rows'])
-                        
-                        # Skip if below minimum threshold
-                        if matching_rows < min_matching_rows:
-                            continue
-                        
-                        # Create result row
-                        result_row = applied_conditions.copy()
-                        result_row['Matching_Rows'] = matching_rows
-                        
-                        # Add aggregated statistics
-                        for col in agg_df.columns:
-                            if col != 'matching_rows':
-                                val = agg_df.iloc[0][col]
-                                if pd.notna(val):
-                                    result_row[col.title().replace('_', ' ')] = round(float(val), 4) if isinstance(val, (int, float)) else val
-                        
-                        # Fetch sample IDs (limited to first 20)
-                        id_query = f"""
-                            SELECT \"{id_column}\"
-                            FROM {table_name}
-                            WHERE {where_clause}
-                            LIMIT 20
-                        """
-                        
-                        id_df = fetch_dataframe_from_db(id_query)
-                        if id_df is not None and not id_df.empty:
-                            ids = id_df[id_column].astype(str).tolist()
-                            if matching_rows > 20:
-                                result_row['IDs'] = ', '.join(ids) + f" ... ({matching_rows - 20} more)"
-                            else:
-                                result_row['IDs'] = ', '.join(ids)
-                        
-                        results.append(result_row)
-                        
+                    query = _grouped_query(from_clause, group_exprs, agg_select, id_column, min_matching_rows)
+                    grouped = _parse_grouped_frame(fetch_dataframe_from_db(query), len(group_exprs))
+                    if grouped is not None:
+                        _store_grouped_results(grouped, list(pending.values()), combo_results)
                 except Exception as e:
                     print(f"Error executing query: {e}")
-                    print(f"Query: {agg_query}")
+                    print(f"Query: {from_clause}")
+            
+            else:
+                # Evaluate many condition sets per query: every row of the table is
+                # tagged with the ids of all condition sets it satisfies (LATERAL UNION ALL,
+                # so overlapping sets are handled), then aggregated per id in one scan.
+                # All batches of the combo are sent over one pooled connection.
+                pending_clauses = list(pending)
+                queries = []
+                requested_per_query = []
+                for batch_start in range(0, len(pending_clauses), CONDITION_SETS_PER_QUERY):
+                    batch = pending_clauses[batch_start:batch_start + CONDITION_SETS_PER_QUERY]
+                    
+                    branches = [f"SELECT {gid} AS _gid WHERE {where_clause}"
+                                for gid, where_clause in enumerate(batch)]
+                    
+                    from_clause = f"""
+                        {table_name} t
+                        CROSS JOIN LATERAL (
+                            {" UNION ALL ".join(branches)}
+                        ) g
+                    """
+                    
+                    queries.append(_grouped_query(from_clause, ["g._gid"], agg_select, id_column, min_matching_rows))
+                    requested_per_query.append(
+                        [(pending[where_clause][0], (gid,)) for gid, where_clause in enumerate(batch)]
+                    )
+                
+                if queries:
+                    try:
+                        frames = fetch_dataframes_from_db(queries)
+                        for grouped_df, requested in zip(frames, requested_per_query):
+                            grouped = _parse_grouped_frame(grouped_df, 1)
+                            if grouped is not None:
+                                _store_grouped_results(grouped, requested, combo_results)
+                    except Exception as e:
+                        print(f"Error executing query: {e}")
+                        print(f"Query: {queries[0]}")
+            
+            # Emit rows in the original condition-set order
+            for applied_conditions, cache_key in entries:
+                cached = combo_results.get(cache_key)
+                if cached is None:
                     continue
+                agg_row, ids = cached
+                
+                matching_rows = int(agg_row['matching_rows'])
+                
+                # Create result row
+                result_row = applied_conditions.copy()
+                result_row['Matching_Rows'] = matching_rows
+                
+                # Add aggregated statistics
+                for col, val in agg_row.items():
+                    if col != 'matching_rows' and pd.notna(val):
+                        result_row[col.title().replace('_', ' ')] = round(float(val), 4) if isinstance(val, (int, float)) else val
+                
+                if pd.notna(ids) and ids:
+                    if matching_rows > 20:
+                        result_row['IDs'] = ids + f" ... ({matching_rows - 20} more)"
+                    else:
+                        result_row['IDs'] = ids
+                
+                results.append(result_row)
     
     return pd.DataFrame(results)
 
 
-def generate_condition_description(column, sql_condition, threshold_config, col_type):
+def _grouped_query(from_clause, group_exprs, agg_select, id_column, min_matching_rows):
     """
-    Generate human-readable description from SQL condition.
+    Build a query aggregating every group of a FROM clause together with up to 20
+    sample IDs per group. Groups below the minimum row count are dropped by
+    HAVING on the server and never returned.
     
     Args:
-        column (str): Column name
-        sql_condition (str): SQL condition string
-        threshold_config (dict): Original threshold configuration
+        from_clause (str): FROM clause (optionally followed by a WHERE clause)
+        group_exprs (list): SQL expressions identifying a condition set
+        agg_select (str): Aggregation select list
+        id_column (str): ID column name
+        min_matching_rows (int): Minimum number of rows required for a group
+    
+    Returns:
+        str: SQL query returning group keys _k0.._kN, the aggregates and _ids
+    """
+    key_select = ", ".join(f"{expr} AS _k{i}" for i, expr in enumerate(group_exprs))
+    key_names = ", ".join(f"_k{i}" for i in range(len(group_exprs)))
+    
+    # Sample IDs (limited to first 20 per condition set) are numbered per group
+    # in the inner query and collected alongside the aggregates
+    return f"""
+        SELECT {key_names}, {agg_select},
+               string_agg(CASE WHEN _rn <= 20 THEN _id::text END, ', ') AS _ids
+        FROM (
+            SELECT {key_select}, t.*, t.\"{id_column}\" AS _id,
+                   row_number() OVER (PARTITION BY {', '.join(group_exprs)}) AS _rn
+            FROM {from_clause}
+        ) m
+        GROUP BY {key_names}
+        HAVING COUNT(*) >= {int(min_matching_rows)}
+    """
+
+
+def _parse_grouped_frame(grouped_df, key_count):
+    """
+    Split the result of a _grouped_query into per-group aggregates and sample IDs.
+    
+    Args:
+        grouped_df (pd.DataFrame): Query result, or None if the query failed
+        key_count (int): Number of group key columns
+    
+    Returns:
+        dict: {group key tuple: (aggregate dict, ids string)}, or None if the query failed
+    """
+    if grouped_df is None:
+        return None
+    
+    key_names = [f"_k{i}" for i in range(key_count)]
+    grouped = {}
+    for _, row in grouped_df.iterrows():
+        key = tuple(int(row[k]) for k in key_names)
+        grouped[key] = (row.drop(key_names + ['_ids']).to_dict(), row['_ids'])
+    
+    return grouped
+
+
+def _store_grouped_results(grouped, requested, combo_results):
+    """
+    Record grouped query results for the requested condition sets, in both the
+    per-combo results and the shared query cache.
+    
+    Args:
+        grouped (dict): Output of _parse_grouped_frame
+        requested (list): (cache_key, group key tuple) pairs
+        combo_results (dict): Per-combo results to update
+    """
+    if len(_QUERY_CACHE) + len(requested) > QUERY_CACHE_MAXSIZE:
+        _QUERY_CACHE.clear()
+    
+    # Condition sets below the minimum row count are cached as None
+    for cache_key, group_key in requested:
+        combo_results[cache_key] = grouped.get(group_key)
+        _QUERY_CACHE[cache_key] = combo_results[cache_key]
+
+
+def _condition_is_empty(metadata):
+    """
+    Check whether a single-column condition can never be satisfied,
+    e.g. "x >= 10 AND x < 5" or a date range that ends before it starts.
+    
+    Args:
+        metadata (dict): Condition metadata from generate_sql_conditions_with_metadata
+    
+    Returns:
+        bool: True if no row can match the condition
+    """
+    if metadata["op"] == "range":
+        try:
+            start, end = float(metadata["start"]), float(metadata["end"])
+        except (TypeError, ValueError):
+            return False
+        return start > end or (start == end and not metadata["include_end"])
+    
+    if metadata["op"] == "between":
+        try:
+            return pd.to_datetime(metadata["start"]) > pd.to_datetime(metadata["end"])
+        except (ValueError, TypeError):
+            return False
+    
+    return False
+
+
+def _conditions_partition_rows(threshold_config, col_type):
+    """
+    Check whether a column's conditions are mutually exclusive, i.e. no row can
+    satisfy more than one of them.
+    
+    Args:
+        threshold_config (dict): Threshold configuration
         col_type (str): Column type
     
     Returns:
-        str: Human-readable description
+        bool: True if the conditions never overlap
     """
-    # Extract key information from SQL condition or use threshold config
+    threshold_type = threshold_config.get("type")
+    
     if col_type == 'date':
-        if 'BETWEEN' in sql_condition:
-            parts = sql_condition.split("BETWEEN")[1].split("AND")
-            if len(parts) == 2:
-                start = parts[0].strip().strip("'")
-                end = parts[1].strip().strip("'")
-                return f"{column}: {start} to {end}"
-        elif '<' in sql_condition and '::date' in sql_condition:
-            date = sql_condition.split("'")[1]
-            return f"{column} before {date}"
-        elif '>' in sql_condition and '::date' in sql_condition:
-            date = sql_condition.split("'")[1]
-            return f"{column} after {date}"
-        elif '=' in sql_condition and '::date' in sql_condition:
-            date = sql_condition.split("'")[1]
-            return f"{column} on {date}"
-            
-    elif col_type == 'numeric':
-        if 'OR' in sql_condition:
-            return f"{column}: {sql_condition}"
-        elif '>=' in sql_condition and '<' in sql_condition:
-            # Range condition
-            parts = sql_condition.split('AND')
-            return f"{column}: {' and '.join(parts)}"
-        elif '>=' in sql_condition:
-            val = sql_condition.split('>=')[1].strip()
-            return f"{column} >= {val}"
-        elif '<' in sql_condition:
-            val = sql_condition.split('<')[1].strip()
-            return f"{column} < {val}"
-        elif '>' in sql_condition:
-            val = sql_condition.split('>')[1].strip()
-            return f"{column} > {val}"
-            
-    elif col_type == 'categorical':
-        if 'IN' in sql_condition:
-            values = sql_condition.split('IN')[1].strip().strip('()').replace("'", "")
-            return f"{column} in [{values}]"
+        if threshold_type == "single_range":
+            return True
+        if threshold_type == "multiple_on":
+            dates = [str(d) for d in threshold_config["dates"]]
+            return len(dates) == len(set(dates))
+        return False
     
-    # Fallback
-    return sql_condition
+    if col_type == 'numeric':
+        if threshold_type == "range":
+            ranges = threshold_config["ranges"]
+            last = len(ranges) - 1
+            # All but the last range are half-open [start, end); the last is closed
+            spans = sorted((float(start), float(end), i == last) for i, (start, end) in enumerate(ranges))
+            for (_, prev_end, prev_closed), (next_start, _, _) in zip(spans, spans[1:]):
+                if next_start < prev_end or (prev_closed and next_start == prev_end):
+                    return False
+            return True
+        if threshold_type == "multiple_conditions_or":
+            # The combined OR condition always overlaps the individual ones
+            return False
+        # mean, median, custom: ">= value" and "< value"
+        return True
+    
+    if col_type == 'categorical':
+        seen = set()
+        for group in threshold_config.get("value_groups") or []:
+            values = {str(v) for v in group}
+            if seen & values:
+                return False
+            seen |= values
+        return True
+    
+    return False
+
+
+def describe_condition(column, metadata):
+    """
+    Generate a human-readable description of a SQL condition from its structured metadata.
+    
+    Args:
+        column (str): Column name
+        metadata (dict): Condition metadata from generate_sql_conditions_with_metadata
+    
+    Returns:
+        str: Human-readable description
+    """
+    op = metadata["op"]
+    
+    if op == "between":
+        return f"{column}: {metadata['start']} to {metadata['end']}"
+    elif op in ("before", "after", "on"):
+        return f"{column} {op} {metadata['date']}"
+    elif op == "last_n_days":
+        return f"{column} last {metadata['days']} days (from {metadata['cutoff']})"
+    elif op == "first_n_days":
+        return f"{column} first {metadata['days']} days (until {metadata['cutoff']})"
+    elif op == "range":
+        closing = "]" if metadata["include_end"] else ")"
+        return f"{column}: [{metadata['start']} to {metadata['end']}{closing}"
+    elif op == "or":
+        return f"{column}: ({' OR '.join(f'{column} {sub_op} {value}' for sub_op, value in metadata['conditions'])})"
+    elif op == "in":
+        return f"{column} in [{', '.join(map(str, metadata['values']))}]"
+    
+    # Single comparison
+    return f"{column} {op} {metadata['value']}"
 
 
 def calculate_max_run(series: pd.Series) -> int:
@@ -198,18 +443,43 @@ def calculate_max_run(series: pd.Series) -> int:
     if series.empty:
         return 0
     
-    max_run = current_run = 1
-    prev_value = series.iloc[0]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Compare integer codes instead of Python objects; missing values (-1)
+        # never extend a run, matching NaN != NaN for other dtypes
+        values = series.cat.codes.to_numpy()
+        return _max_run_length(values, (values[1:] != values[:-1]) | (values[1:] == -1))
     
-    for value in series.iloc[1:]:
-        if value == prev_value:
-            current_run += 1
-            max_run = max(max_run, current_run)
-        else:
-            current_run = 1
-        prev_value = value
-    
-    return max_run
+    values = series.to_numpy()
+    if NUMBA_AVAILABLE and values.dtype.kind in 'biuf':
+        # Plain numeric buffer: single compiled scan, no temporary arrays
+        return int(float_max_run(values))
+    return max_run_of_array(values)
+
+def max_run_of_array(values):
+    """Longest run of equal consecutive values in a NumPy array (NaN never extends a run)"""
+    if values.size == 0:
+        return 0
+    return _max_run_length(values, values[1:] != values[:-1])
+
+def median_of_array(values):
+    """
+    Median of a NumPy array without NaNs, by quickselect: one O(n) partition around
+    the middle instead of np.median's extra NaN check.
+    """
+    n = values.size
+    if n == 0:
+        return np.nan
+    k = n // 2
+    partitioned = np.partition(values, k)
+    if n % 2:
+        return partitioned[k]
+    # Even count: average with the largest value of the lower half
+    return 0.5 * (partitioned[k] + partitioned[:k].max())
+
+def _max_run_length(values, breaks):
+    """Run-length encode: run boundaries are the positions where the value changes"""
+    boundaries = np.flatnonzero(np.concatenate(([True], breaks, [True])))
+    return int(np.diff(boundaries).max())
 
 def is_date_column(df, column):
     """Check if a column contains date/datetime data"""
@@ -248,7 +518,6 @@ def is_date_column(df, column):
             if any(pattern in sample_str for pattern in date_patterns):
                 # Try to parse a sample
                 try:
-                    pd.to_datetime(sample, errors='coerce')
                     parsed = pd.to_datetime(sample, errors='coerce')
                     # If majority can be parsed as dates, consider it a date column
                     if parsed.notna().sum() / len(sample) > 0.5:
@@ -266,397 +535,865 @@ def get_date_columns(df):
             date_columns.append(col)
     return date_columns
 
-def apply_date_filter(df, column, threshold_config):
-    """Apply date filtering based on the threshold configuration"""
-    col_data = pd.to_datetime(df[column], errors='coerce')
+def datetime_values(series):
+    """
+    Parse a column into a datetime64[ns] NumPy array (NaT where unparseable).
+    Timezone-aware values keep their local wall-clock time.
+    """
+    col_data = pd.to_datetime(series, errors='coerce')
+    if getattr(col_data.dt, 'tz', None) is not None:
+        col_data = col_data.dt.tz_localize(None)
+    return col_data.to_numpy(dtype='datetime64[ns]')
+
+def date_condition_mask(values, threshold_data, operator):
+    """
+    Build a boolean mask for a date condition using NumPy datetime64 comparisons.
+    Calendar-day conditions compare at day precision; N-days cutoffs compare
+    full timestamps. NaT never matches.
     
-    if threshold_config["type"] == "single_range":
-        start_date = pd.to_datetime(threshold_config["start_date"])
-        end_date = pd.to_datetime(threshold_config["end_date"])
-        mask = (col_data.dt.date >= start_date.date()) & (col_data.dt.date <= end_date.date())
-        return df[mask]
-        
-    elif threshold_config["type"] == "before":
-        target_date = pd.to_datetime(threshold_config["date"])
-        mask = col_data.dt.date < target_date.date()
-        return df[mask]
-        
-    elif threshold_config["type"] == "after":
-        target_date = pd.to_datetime(threshold_config["date"])
-        mask = col_data.dt.date > target_date.date()
-        return df[mask]
-        
-    elif threshold_config["type"] == "on":
-        target_date = pd.to_datetime(threshold_config["date"])
-        mask = col_data.dt.date == target_date.date()
-        return df[mask]
-        
-    elif threshold_config["type"] == "last_n_days":
-        cutoff_date = pd.to_datetime(threshold_config["cutoff_date"])
-        mask = col_data >= cutoff_date
-        return df[mask]
-        
-    elif threshold_config["type"] == "first_n_days":
-        cutoff_date = pd.to_datetime(threshold_config["cutoff_date"])
-        mask = col_data <= cutoff_date
-        return df[mask]
+    Args:
+        values (np.ndarray): datetime64[ns] values from datetime_values
+        threshold_data: Date range dict, single date or cutoff dict (per operator)
+        operator (str): 'single_range', 'range', 'before', 'after', 'on',
+            'last_n_days' or 'first_n_days'
+    
+    Returns:
+        np.ndarray: Boolean mask
+    """
+    if operator in ('last_n_days', 'first_n_days'):
+        cutoff_date = pd.to_datetime(threshold_data["cutoff_date"]).to_datetime64()
+        if operator == 'last_n_days':
+            return values >= cutoff_date
+        return values <= cutoff_date
+    
+    days = values.astype('datetime64[D]')
+    
+    if operator in ('single_range', 'range'):
+        start_day = pd.to_datetime(threshold_data["start_date"]).to_datetime64().astype('datetime64[D]')
+        end_day = pd.to_datetime(threshold_data["end_date"]).to_datetime64().astype('datetime64[D]')
+        return (days >= start_day) & (days <= end_day)
+    
+    target_day = pd.to_datetime(threshold_data).to_datetime64().astype('datetime64[D]')
+    if operator == 'before':
+        return days < target_day
+    elif operator == 'after':
+        return days > target_day
+    elif operator == 'on':
+        return days == target_day
+    
+    return np.ones(len(values), dtype=bool)
+
+def sorted_date_values(values):
+    """
+    Sort the valid (non-NaT) values of a datetime_values array once, so that
+    date conditions can be counted with binary searches (date_condition_count).
+    
+    Returns:
+        tuple: (sorted datetime64[ns] values, the same values at day precision)
+    """
+    valid_values = np.sort(values[~np.isnat(values)])
+    return valid_values, valid_values.astype('datetime64[D]')
+
+def date_condition_count(sorted_values, threshold_data, operator):
+    """
+    Count the rows date_condition_mask would match, in O(log N) per condition
+    with np.searchsorted instead of a full comparison pass.
+    
+    Args:
+        sorted_values (tuple): Output of sorted_date_values
+        threshold_data: Date range dict, single date or cutoff dict (per operator)
+        operator (str): 'single_range', 'range', 'before', 'after', 'on',
+            'last_n_days' or 'first_n_days'
+    
+    Returns:
+        int: Number of matching rows
+    """
+    values, days = sorted_values
+    
+    if operator in ('last_n_days', 'first_n_days'):
+        cutoff_date = pd.to_datetime(threshold_data["cutoff_date"]).to_datetime64()
+        if operator == 'last_n_days':
+            return len(values) - int(np.searchsorted(values, cutoff_date, side='left'))
+        return int(np.searchsorted(values, cutoff_date, side='right'))
+    
+    if operator in ('single_range', 'range'):
+        start_day = pd.to_datetime(threshold_data["start_date"]).to_datetime64().astype('datetime64[D]')
+        end_day = pd.to_datetime(threshold_data["end_date"]).to_datetime64().astype('datetime64[D]')
+        count = np.searchsorted(days, end_day, side='right') - np.searchsorted(days, start_day, side='left')
+        return max(int(count), 0)
+    
+    target_day = pd.to_datetime(threshold_data).to_datetime64().astype('datetime64[D]')
+    if operator == 'before':
+        return int(np.searchsorted(days, target_day, side='left'))
+    elif operator == 'after':
+        return len(days) - int(np.searchsorted(days, target_day, side='right'))
+    elif operator == 'on':
+        return int(np.searchsorted(days, target_day, side='right') - np.searchsorted(days, target_day, side='left'))
     
-    return df
+    return len(values)
+
+@lru_cache(maxsize=2048)
+def _format_date(value):
+    """Format a date-like threshold value as YYYY-MM-DD (memoized, thresholds repeat a lot)"""
+    return pd.Timestamp(value).date().isoformat()
 
 def generate_date_condition_description(column, threshold_data, operator):
     """Generate human-readable description for date conditions"""
     if operator == 'single_range':
-        start = pd.to_datetime(threshold_data["start_date"]).strftime('%Y-%m-%d')
-        end = pd.to_datetime(threshold_data["end_date"]).strftime('%Y-%m-%d')
+        start = _format_date(threshold_data["start_date"])
+        end = _format_date(threshold_data["end_date"])
         return f"{column}: {start} to {end}"
         
     elif operator == 'range':
-        start = pd.to_datetime(threshold_data["start_date"]).strftime('%Y-%m-%d')
-        end = pd.to_datetime(threshold_data["end_date"]).strftime('%Y-%m-%d')
+        start = _format_date(threshold_data["start_date"])
+        end = _format_date(threshold_data["end_date"])
         return f"{column}: {start} to {end}"
         
     elif operator == 'before':
-        date_str = pd.to_datetime(threshold_data).strftime('%Y-%m-%d')
+        date_str = _format_date(threshold_data)
         return f"{column} before {date_str}"
         
     elif operator == 'after':
-        date_str = pd.to_datetime(threshold_data).strftime('%Y-%m-%d')
+        date_str = _format_date(threshold_data)
         return f"{column} after {date_str}"
         
     elif operator == 'on':
-        date_str = pd.to_datetime(threshold_data).strftime('%Y-%m-%d')
+        date_str = _format_date(threshold_data)
         return f"{column} on {date_str}"
         
     elif operator == 'last_n_days':
         days = threshold_data["days"]
-        cutoff = pd.to_datetime(threshold_data["cutoff_date"]).strftime('%Y-%m-%d')
+        cutoff = _format_date(threshold_data["cutoff_date"])
         return f"{column} last {days} days (from {cutoff})"
         
     elif operator == 'first_n_days':
         days = threshold_data["days"]
-        cutoff = pd.to_datetime(threshold_data["cutoff_date"]).strftime('%Y-%m-%d')
+        cutoff = _format_date(threshold_data["cutoff_date"])
         return f"{column} first {days} days (until {cutoff})"
     
     return f"{column}: unknown date filter"
 
 def analyze_data_combinations(df, selected_columns, thresholds, id_column, result_columns, min_matching_rows=10):
-    results = []
+    # Classify each column once ('date', 'numeric' or 'categorical') instead of
+    # re-probing dtypes for every combination and condition
+    column_kinds = {col: _column_kind(df, col) for col in selected_columns}
     
-    for combo_length in range(1, len(selected_columns) + 1):
-        # Get all combinations of columns for this length
-        for column_combo in combinations(selected_columns, combo_length):
+    # Parse each date column once; date conditions compare against these full-length arrays
+    dt_cache = {col: datetime_values(df[col]) for col, kind in column_kinds.items() if kind == 'date'}
+    
+    # Numeric columns as contiguous float arrays (NaN for missing) so conditions compare
+    # raw NumPy data with sequential loads, whatever block layout pandas stores them in
+    np_cache = {
+        col: np.ascontiguousarray(df[col].to_numpy(dtype=float, na_value=np.nan))
+        for col, kind in column_kinds.items()
+        if kind == 'numeric'
+    }
+    
+    # Categorical columns as integer codes (-1 for missing) plus their distinct values,
+    # so value-group conditions become a lookup-table gather instead of hashing every row
+    code_cache = {
+        col: pd.factorize(df[col])
+        for col, kind in column_kinds.items()
+        if kind == 'categorical'
+    }
+    
+    # A column's condition variations do not depend on the combination it appears in
+    column_variations = {}
+    for col in selected_columns:
+        variations = _column_condition_variations(col, thresholds[col], column_kinds[col])
+        if variations is not None:
+            column_variations[col] = variations
+    
+    # Result columns stacked into one C-ordered (columns x rows) float matrix for the
+    # stats kernel: each result column is a contiguous row, and so is each row of the
+    # matched submatrix gathered from it
+    stat_columns = [col for col in result_columns if col in df.columns]
+    if stat_columns:
+        result_matrix = np.ascontiguousarray(
+            np.vstack([df[col].to_numpy(dtype=float, na_value=np.nan) for col in stat_columns])
+        )
+    else:
+        result_matrix = np.empty((0, len(df)))
+    
+    # A result column without a single value never gets statistics: drop it up front
+    # instead of gathering and reducing it for every condition set
+    has_values = ~np.isnan(result_matrix).all(axis=1)
+    if not has_values.all():
+        stat_columns = [col for col, keep in zip(stat_columns, has_values) if keep]
+        result_matrix = result_matrix[has_values]
+    
+    # Store the matrix as float32 when that loses nothing (e.g. integer-valued results
+    # below 2**24): every per-combination gather then moves half the bytes. Gathered
+    # values are widened back to float64 before any statistic is computed.
+    # The range check comes first so out-of-range values never reach the cast
+    # (which would overflow) and no trial copy is made for them
+    float32_max = np.finfo(np.float32).max
+    if result_matrix.size and -float32_max <= np.nanmin(result_matrix) and np.nanmax(result_matrix) <= float32_max:
+        narrow_matrix = result_matrix.astype(np.float32)
+        if np.array_equal(narrow_matrix, result_matrix, equal_nan=True):
+            result_matrix = narrow_matrix
+    integer_result_cols = {col for col in stat_columns if pd.api.types.is_integer_dtype(df[col])}
+    
+    # Results are collected column by column: condition descriptions, match count,
+    # the statistics of each result column and the IDs
+    stat_suffixes = ('Mean', 'Max_Run', 'Sum', 'Count', 'Std_Dev', 'Median', 'Min', 'Max')
+    stat_keys = [[f'{col}_{suffix}' for suffix in stat_suffixes] for col in stat_columns]
+    result_schema = list(selected_columns) + ['Matching_Rows'] + [key for keys in stat_keys for key in keys]
+    
+    # Positions of the (at most 20) IDs shown for each result row; the IDs are
+    # converted to text in one batch once all results are known
+    id_rows = []
+    
+    # Evaluated conditions keyed by (column, position in the column's condition list)
+    condition_cache = {}
+    
+    # Per-row condition labels of columns whose conditions never overlap (None otherwise)
+    partition_cache = {}
+    
+    # Contiguous numeric ranges: one binary search over the range edges labels every
+    # row with its range, instead of two comparisons over the column per range
+    for col in selected_columns:
+        if col not in np_cache or thresholds[col]["type"] != "range":
+            continue
+        ranges = thresholds[col]["ranges"]
+        codes = _range_bin_codes(np_cache[col], ranges)
+        if codes is None:
+            continue
+        partition_cache[col] = codes
+        counts = np.bincount(codes + 1, minlength=len(ranges) + 1)[1:]
+        for i, (start, end) in enumerate(ranges):
+            description = _range_description(col, start, end, i == len(ranges) - 1)
+            condition_cache[(col, i)] = (col, codes == i, int(counts[i]), description, True)
+    
+    # Evaluate every condition once per analysis: its row mask, match count and
+    # description are reused by every combination and condition set it appears in.
+    # Doing it up front leaves the per-combination work read-only, so combinations
+    # can run on worker threads.
+    evaluated_columns = {}
+    for col, variations in column_variations.items():
+        evaluated = []
+        for i, condition_item in enumerate(variations):
+            key = (col, i)
+            if key not in condition_cache:
+                condition_cache[key] = _evaluate_condition(condition_item, df, column_kinds, dt_cache, np_cache, code_cache)
+            evaluated.append(condition_cache[key])
+        evaluated_columns[col] = evaluated
+        if col not in partition_cache:
+            partition_cache[col] = _partition_codes(evaluated, len(df))
+    
+    def analyze_combo(column_combo):
+        """Result columns and shown-ID positions of one column combination"""
+        combo_results = {key: [] for key in result_schema}
+        combo_id_rows = []
+        
+        # Columns without conditions do not constrain the combination
+        combo_columns = [col for col in column_combo if col in column_variations]
+        
+        # A condition that can never be applied invalidates every set containing it,
+        # so leave it out of the product instead of checking each set
+        evaluated_variations = [
+            [condition for condition in evaluated_columns[col] if condition[4]]
+            for col in combo_columns
+        ]
+        
+        # Columns outside the combination are blank in every result
+        blank_columns = [col for col in selected_columns if col not in combo_columns]
+        
+        # When every column's conditions are mutually exclusive, each row belongs to at
+        # most one condition set. Label rows with their set (numbered in product order)
+        # so one bincount and one stable sort give every set's count and rows at once.
+        partition_codes = [partition_cache[col] for col in combo_columns]
+        
+        group_starts = None
+        if evaluated_variations and all(codes is not None for codes in partition_codes):
+            n_groups = 1
+            group_ids = np.zeros(len(df), dtype=np.int64)
+            in_group = np.ones(len(df), dtype=bool)
+            for codes, evaluated in zip(partition_codes, evaluated_variations):
+                n_groups *= len(evaluated)
+                group_ids = group_ids * len(evaluated) + codes
+                in_group &= codes >= 0
+            # Rows outside every set go to an extra trailing group
+            group_ids[~in_group] = n_groups
             
-            # For each combination, generate all condition variations
-            condition_variations = []
-            for col in column_combo:
-                threshold_config = thresholds[col]
-                
-                if is_date_column(df, col):
-                    if threshold_config["type"] == "single_range":
-                        condition_variations.append([(col, threshold_config, 'single_range')])
-                    elif threshold_config["type"] == "multiple_ranges":
-                        range_conditions = []
-                        for range_config in threshold_config["ranges"]:
-                            range_conditions.append((col, range_config, 'range'))
-                        condition_variations.append(range_conditions)
-                    elif threshold_config["type"] == "multiple_before":
-                        before_conditions = []
-                        for date in threshold_config["dates"]:
-                            before_conditions.append((col, date, 'before'))
-                        condition_variations.append(before_conditions)
-                    elif threshold_config["type"] == "multiple_after":
-                        after_conditions = []
-                        for date in threshold_config["dates"]:
-                            after_conditions.append((col, date, 'after'))
-                        condition_variations.append(after_conditions)
-                    elif threshold_config["type"] == "multiple_on":
-                        on_conditions = []
-                        for date in threshold_config["dates"]:
-                            on_conditions.append((col, date, 'on'))
-                        condition_variations.append(on_conditions)
-                    elif threshold_config["type"] == "multiple_last_n_days":
-                        last_n_conditions = []
-                        for config in threshold_config["configs"]:
-                            last_n_conditions.append((col, config, 'last_n_days'))
-                        condition_variations.append(last_n_conditions)
-                    elif threshold_config["type"] == "multiple_first_n_days":
-                        first_n_conditions = []
-                        for config in threshold_config["configs"]:
-                            first_n_conditions.append((col, config, 'first_n_days'))
-                        condition_variations.append(first_n_conditions)
-
-                elif pd.api.types.is_numeric_dtype(df[col]):
-                    if threshold_config["type"] == "range":
-                        # For range: create conditions for each range
-                        range_conditions = []
-                        for i, (start, end) in enumerate(threshold_config["ranges"]):
-                            range_conditions.append(
-                                (col, {"start": start, "end": end, "range_id": i+1, "total_ranges": len(threshold_config["ranges"])}, 'range')
-                            )
-                        condition_variations.append(range_conditions)
-                    elif threshold_config["type"] == "multiple_greater_than":
-                        # Create conditions for each greater than value
-                        multiple_greater_conditions = []
-                        for value in threshold_config["values"]:
-                            multiple_greater_conditions.append(
-                                (col, value, '>')
-                            )
-                        condition_variations.append(multiple_greater_conditions)
-                    elif threshold_config["type"] == "multiple_less_than":
-                        multiple_less_conditions = []
-                        for value in threshold_config["values"]:
-                            multiple_less_conditions.append(
-                                (col, value, '<')
-                            )
-                        condition_variations.append(multiple_less_conditions)
-                    elif threshold_config["type"] == "multiple_conditions_or":
-                        # Create individual conditions AND the combined OR condition
-                        individual_conditions = []
-                        for condition in threshold_config["conditions"]:
-                            # Each individual condition as a single tuple
-                            individual_conditions.append(
-                                (col, condition["value"], condition["operator"])
-                            )
-                        
-                        # Add the combined OR condition as well (as a list of tuples)
-                        or_condition_group = []
-                        for condition in threshold_config["conditions"]:
-                            or_condition_group.append(
-                                (col, condition["value"], condition["operator"])
-                            )
-                        individual_conditions.append(or_condition_group)
-                        
-                        condition_variations.append(individual_conditions)
-                    else:  # mean, median, custom
-                        # For traditional thresholds: both >= and < conditions
-                        condition_variations.append([
-                            (col, threshold_config["value"], '>='),
-                            (col, threshold_config["value"], '<')
-                        ])
+            group_rows = np.argsort(group_ids, kind='stable')
+            group_starts = np.concatenate(([0], np.cumsum(np.bincount(group_ids, minlength=n_groups + 1))))
+        
+        if group_starts is not None:
+            # Set sizes are known, so only sets with enough rows are visited; their
+            # conditions follow from the set number
+            shape = [len(evaluated) for evaluated in evaluated_variations]
+            set_sizes = np.diff(group_starts[:n_groups + 1])
+            condition_sets = (
+                (set_index, [evaluated_variations[k][i] for k, i in enumerate(np.unravel_index(set_index, shape))])
+                for set_index in np.flatnonzero(set_sizes >= max(min_matching_rows, 1))
+            )
+        else:
+            # Generate all products of condition variations
+            condition_sets = enumerate(product(*evaluated_variations))
+        
+        for set_index, condition_set in condition_sets:
+            if group_starts is not None:
+                # Rows of this condition set, in row order
+                matched_rows = group_rows[group_starts[set_index]:group_starts[set_index + 1]]
+                matching_rows = len(matched_rows)
+            else:
+                # Combine masks most selective first; once the running count falls
+                # below the minimum no further condition can bring it back up
+                ordered = sorted(
+                    ((cond_mask, count) for _, cond_mask, count, _, _ in condition_set if cond_mask is not None),
+                    key=lambda item: item[1]
+                )
+                if ordered:
+                    mask, matching_rows = ordered[0]
+                    for sub_mask, _ in ordered[1:]:
+                        if matching_rows == 0 or matching_rows < min_matching_rows:
+                            break
+                        mask = mask & sub_mask
+                        matching_rows = int(np.count_nonzero(mask))
                 else:
-                    # For categorical: include condition with multiple value groups
-                    if threshold_config["type"] == "categorical" and threshold_config["value_groups"]:
-                        group_conditions = []
-                        for group in threshold_config["value_groups"]:
-                            if group:  # Only if group has values
-                                group_conditions.append(
-                                    (col, group, 'include')
-                                )
-                        condition_variations.append(group_conditions)
+                    mask = np.ones(len(df), dtype=bool)
+                    matching_rows = len(df)
+                matched_rows = None
             
-            # Generate all products of condition variations
-            for condition_set in product(*condition_variations):
-                # Apply all conditions in this set
-                filtered_df = df.copy()
-                applied_conditions = {}
+            # Calculate result if data remains
+            if matching_rows > 0:
+                # Check minimum matching rows threshold
+                if matching_rows < min_matching_rows:
+                    continue  # Skip this combination as it doesn't meet minimum threshold
                 
-                # Initialize all selected columns as blank
-                for col in selected_columns:
-                    applied_conditions[col] = ""
+                if matched_rows is None:
+                    matched_rows = np.flatnonzero(mask)
                 
-                # Apply each condition
-                valid_filter = True
-                for condition_item in condition_set:
-                    # Handle OR logic conditions (list of conditions)
-                    if isinstance(condition_item, list) and len(condition_item) > 0 and isinstance(condition_item[0], tuple):
-                        # This is an OR condition group
-                        col = condition_item[0][0]  # Get column from first condition
-                        
-                        if pd.api.types.is_numeric_dtype(df[col]):
-                            # Handle multiple conditions with OR logic
-                            or_mask = pd.Series([False] * len(filtered_df), index=filtered_df.index)
-                            condition_descriptions = []
-                            
-                            for sub_col, sub_value, sub_operator in condition_item:
-                                if sub_operator == '>':
-                                    or_mask |= (filtered_df[sub_col] > sub_value)
-                                    condition_descriptions.append(f"{sub_col} > {sub_value:.2f}")
-                                elif sub_operator == '<':
-                                    or_mask |= (filtered_df[sub_col] < sub_value)
-                                    condition_descriptions.append(f"{sub_col} < {sub_value:.2f}")
-                                elif sub_operator == '>=':
-                                    or_mask |= (filtered_df[sub_col] >= sub_value)
-                                    condition_descriptions.append(f"{sub_col} >= {sub_value:.2f}")
-                                elif sub_operator == '<=':
-                                    or_mask |= (filtered_df[sub_col] <= sub_value)
-                                    condition_descriptions.append(f"{sub_col} <= {sub_value:.2f}")
-                            
-                            filtered_df = filtered_df[or_mask]
-                            applied_conditions[col] = f"({' OR '.join(condition_descriptions)})"
-                        continue
-                    
-                    # Handle regular conditions (single tuple)
-                    col, threshold_data, operator = condition_item
-                    
-                    if is_date_column(df, col):
-                        if operator == 'single_range':
-                            filtered_df = apply_date_filter(filtered_df, col, threshold_data)
-                            applied_conditions[col] = generate_date_condition_description(col, threshold_data, operator)
-                        elif operator == 'range':
-                            # Apply range filtering
-                            start_date = pd.to_datetime(threshold_data["start_date"])
-                            end_date = pd.to_datetime(threshold_data["end_date"])
-                            col_data = pd.to_datetime(filtered_df[col], errors='coerce')
-                            mask = (col_data.dt.date >= start_date.date()) & (col_data.dt.date <= end_date.date())
-                            filtered_df = filtered_df[mask]
-                            applied_conditions[col] = generate_date_condition_description(col, threshold_data, operator)
-                        elif operator in ['before', 'after', 'on']:
-                            # Apply single date filtering
-                            col_data = pd.to_datetime(filtered_df[col], errors='coerce')
-                            target_date = pd.to_datetime(threshold_data)
-                            
-                            if operator == 'before':
-                                mask = col_data.dt.date < target_date.date()
-                            elif operator == 'after':
-                                mask = col_data.dt.date > target_date.date()
-                            elif operator == 'on':
-                                mask = col_data.dt.date == target_date.date()
-                                
-                            filtered_df = filtered_df[mask]
-                            applied_conditions[col] = generate_date_condition_description(col, threshold_data, operator)
-                        elif operator in ['last_n_days', 'first_n_days']:
-                            # Apply N days filtering
-                            col_data = pd.to_datetime(filtered_df[col], errors='coerce')
-                            cutoff_date = pd.to_datetime(threshold_data["cutoff_date"])
-                            
-                            if operator == 'last_n_days':
-                                mask = col_data >= cutoff_date
-                            elif operator == 'first_n_days':
-                                mask = col_data <= cutoff_date
-                                
-                            filtered_df = filtered_df[mask]
-                            applied_conditions[col] = generate_date_condition_description(col, threshold_data, operator)
-
-                    elif pd.api.types.is_numeric_dtype(df[col]):
-                        if operator == 'range':
-                            start = threshold_data["start"]
-                            end = threshold_data["end"]
-                            range_id = threshold_data["range_id"]
-                            total_ranges = threshold_data["total_ranges"]
-                            
-                            # Apply range condition: >= start and < end (except for last range which includes end)
-                            if range_id == total_ranges:  # Last range
-                                filtered_df = filtered_df[(filtered_df[col] >= start) & (filtered_df[col] <= end)]
-                                applied_conditions[col] = f"{col}: [{start:.2f} to {end:.2f}]"
-                            else:
-                                filtered_df = filtered_df[(filtered_df[col] >= start) & (filtered_df[col] < end)]
-                                applied_conditions[col] = f"{col}: [{start:.2f} to {end:.2f})"
-                        elif isinstance(operator, list):
-                            # This should not happen anymore as OR logic is handled above
-                            pass
-                        elif operator == '>=':
-                            filtered_df = filtered_df[filtered_df[col] >= threshold_data]
-                            applied_conditions[col] = f"{col} >= {threshold_data:.2f}"
-                        elif operator == '<':
-                            filtered_df = filtered_df[filtered_df[col] < threshold_data]
-                            applied_conditions[col] = f"{col} < {threshold_data:.2f}"
-                        elif operator == '>':
-                            filtered_df = filtered_df[filtered_df[col] > threshold_data]
-                            applied_conditions[col] = f"{col} > {threshold_data:.2f}"
-                    else:
-                        if operator == 'include' and threshold_data:  # Only if values selected
-                            filtered_df = filtered_df[filtered_df[col].isin(threshold_data)]
-                            # Format the values list nicely
-                            if len(threshold_data) == 1:
-                                applied_conditions[col] = f"{col} = {threshold_data[0]}"
-                            elif len(threshold_data) <= 3:
-                                applied_conditions[col] = f"{col} in [{', '.join(map(str, threshold_data))}]"
-                            else:
-                                applied_conditions[col] = f"{col} in [{', '.join(map(str, threshold_data[:3]))}...] ({len(threshold_data)} values)"
-                        elif not threshold_data:
-                            valid_filter = False
-                            break
+                # Condition columns first
+                for col in blank_columns:
+                    combo_results[col].append("")
+                for col, _, _, description, _ in condition_set:
+                    combo_results[col].append(description if description is not None else "")
                 
-                # Calculate result if filter is valid and data remains
-                if valid_filter and not filtered_df.empty:
-                    # Check minimum matching rows threshold
-                    matching_rows = len(filtered_df)
-                    if matching_rows < min_matching_rows:
-                        continue  # Skip this combination as it doesn't meet minimum threshold
-                    
-                    # Create result row with condition columns first
-                    result_row = applied_conditions.copy()
-                    
-                    # Add matching rows count
-                    result_row['Matching_Rows'] = matching_rows
-                    
-                    # Calculate statistics for selected result columns
-                    for result_col in result_columns:
-                        if result_col in filtered_df.columns:
-                            col_data = filtered_df[result_col].dropna()
-                            
-                            if not col_data.empty:
-                                # Calculate mean
-                                mean_value = col_data.mean()
-                                if not pd.isna(mean_value):
-                                    result_row[f'{result_col}_Mean'] = round(mean_value, 4)
-                                
-                                # Calculate max run
-                                max_run = calculate_max_run(col_data)
-                                result_row[f'{result_col}_Max_Run'] = max_run
-
-                                # Calculate sum
-                                sum_value = col_data.sum()
-                                if not pd.isna(sum_value):
-                                    result_row[f'{result_col}_Sum'] = round(sum_value, 4)
-                                
-                                # Calculate count
-                                result_row[f'{result_col}_Count'] = len(col_data)
-                                
-                                # Calculate standard deviation
-                                std_value = col_data.std()
-                                if not pd.isna(std_value):
-                                    result_row[f'{result_col}_Std_Dev'] = round(std_value, 4)
-                                
-                                # Calculate median
-                                median_value = col_data.median()
-                                if not pd.isna(median_value):
-                                    result_row[f'{result_col}_Median'] = round(median_value, 4)
-                                
-                                # Calculate min and max
-                                result_row[f'{result_col}_Min'] = round(col_data.min(), 4)
-                                result_row[f'{result_col}_Max'] = round(col_data.max(), 4)
+                # Add matching rows count
+                combo_results['Matching_Rows'].append(matching_rows)
+                
+                # Mean, sum, count, std, min and max of every result column in one pass
+                # (nothing to gather when there are no result columns)
+                if stat_columns:
+                    matched_values = result_matrix[:, matched_rows].astype(np.float64, copy=False)
+                    stats = column_stats(matched_values)
+                
+                # Calculate statistics for selected result columns
+                for k, result_col in enumerate(stat_columns):
+                    mean_value, sum_value, count, std_value, min_value, max_value = stats[k]
+                    mean_key, max_run_key, sum_key, count_key, std_key, median_key, min_key, max_key = stat_keys[k]
                     
-                    # Add actual IDs (first 20 if more than 20)
-                    ids = filtered_df[id_column].astype(str).tolist()
-                    if len(ids) > 20:
-                        ids = ids[:20]
-                        result_row['IDs'] = ', '.join(ids) + f" ... ({len(filtered_df) - 20} more)"
+                    if count == 0:
+                        # No values to describe: leave the statistics missing
+                        for key in stat_keys[k]:
+                            combo_results[key].append(np.nan)
                     else:
-                        result_row['IDs'] = ', '.join(ids)
-                    
-                    results.append(result_row)
+                        # Non-missing matched values, in row order
+                        col_values = matched_values[k][~np.isnan(matched_values[k])]
+                        cast = int if result_col in integer_result_cols else float
+                        
+                        # Calculate mean
+                        combo_results[mean_key].append(mean_value)
+                        
+                        # Calculate max run
+                        max_run = float_max_run(col_values)
+                        combo_results[max_run_key].append(max_run)
+
+                        # Calculate sum
+                        combo_results[sum_key].append(cast(sum_value))
+                        
+                        # Calculate count
+                        combo_results[count_key].append(int(count))
+                        
+                        # Calculate standard deviation (NaN, i.e. missing, for a single value)
+                        combo_results[std_key].append(std_value)
+                        
+                        # Calculate median
+                        combo_results[median_key].append(median_of_array(col_values))
+                        
+                        # Calculate min and max
+                        combo_results[min_key].append(cast(min_value))
+                        combo_results[max_key].append(cast(max_value))
+                
+                # Add actual IDs (first 20 if more than 20), filled in below
+                combo_id_rows.append(matched_rows[:20])
+        
+        return combo_results, combo_id_rows
     
-    return pd.DataFrame(results)
+    # Get all combinations of columns, shortest first
+    all_combos = [
+        column_combo
+        for combo_length in range(1, len(selected_columns) + 1)
+        for column_combo in combinations(selected_columns, combo_length)
+    ]
+    
+    # Combinations are independent; NumPy and the Numba kernels release the GIL, so
+    # threads spread them over the cores. map() keeps the results in combination order.
+    if ANALYSIS_WORKERS > 1 and len(all_combos) > 1:
+        with ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS) as executor:
+            combo_outputs = list(executor.map(analyze_combo, all_combos))
+    else:
+        combo_outputs = map(analyze_combo, all_combos)
+    
+    results = {key: [] for key in result_schema}
+    for combo_results, combo_id_rows in combo_outputs:
+        for key, values in combo_results.items():
+            results[key].extend(values)
+        id_rows.extend(combo_id_rows)
+    
+    if not id_rows:
+        return pd.DataFrame()
+    
+    results['IDs'] = _result_ids(results['Matching_Rows'], id_rows, df[id_column])
+    
+    # Build the frame from whole columns; statistics that no result has (e.g. the
+    # standard deviation when every set matched a single value) are left out
+    results_df = pd.DataFrame({
+        key: values for key, values in results.items()
+        if not (key != 'IDs' and key not in selected_columns and all(np.isnan(v) for v in values))
+    })
+    
+    # Round every statistic to 4 decimals in one pass over the frame, with Python's
+    # correctly rounded round() (NumPy's round can land on the other side of a
+    # near-tie, e.g. 0.11125 -> 0.1112 instead of 0.1113)
+    float_cols = results_df.select_dtypes('float').columns
+    results_df[float_cols] = results_df[float_cols].map(lambda value: round(float(value), 4))
+    return results_df
 
-def apply_single_condition(df, column, threshold_config, operator):
-    """Apply a single condition to the dataframe"""
+def _result_ids(matching_rows, id_rows, id_series):
+    """
+    Build the IDs text of each result, converting only the IDs that are shown
+    (every result's first 20 matching rows) to strings, in a single batch.
+    
+    Args:
+        matching_rows (list): Matching row count of each result
+        id_rows (list): Row positions of the IDs shown for each result
+        id_series (pd.Series): The ID column
+    
+    Returns:
+        list: IDs text per result
+    """
+    needed, positions = np.unique(np.concatenate(id_rows), return_inverse=True)
+    if id_series.dtype.kind in 'mM':
+        # Datetime text formatting depends on the whole column, so convert all of it
+        id_strings = id_series.astype(str).to_numpy()[needed]
+    else:
+        id_strings = id_series.iloc[needed].astype(str).to_numpy()
+    
+    result_ids = []
+    offset = 0
+    for count, rows in zip(matching_rows, id_rows):
+        ids = id_strings[positions[offset:offset + len(rows)]].tolist()
+        offset += len(rows)
+        if count > 20:
+            result_ids.append(', '.join(ids) + f" ... ({count - 20} more)")
+        else:
+            result_ids.append(', '.join(ids))
+    return result_ids
+
+# Comparison operators allowed inside an OR condition group
+_OR_COMPARISONS = {
+    '>': np.greater,
+    '<': np.less,
+    '>=': np.greater_equal,
+    '<=': np.less_equal,
+}
+
+def _column_kind(df, column):
+    """Classify a column as 'date', 'numeric' or 'categorical' for condition dispatch"""
     if is_date_column(df, column):
-        return apply_date_filter(df, column, threshold_config)
-    elif pd.api.types.is_numeric_dtype(df[column]):
+        return 'date'
+    if pd.api.types.is_numeric_dtype(df[column]):
+        return 'numeric'
+    return 'categorical'
+
+def _column_condition_variations(col, threshold_config, kind):
+    """
+    Build the conditions analyze_data_combinations tries for one column.
+    
+    Args:
+        col (str): Column name
+        threshold_config (dict): The column's threshold configuration
+        kind (str): Column kind from _column_kind
+    
+    Returns:
+        list or None: (column, threshold data, operator) tuples (a list of such tuples
+        for an OR condition group), or None if the configuration adds no conditions
+    """
+    if kind == 'date':
+        if threshold_config["type"] == "single_range":
+            return [(col, threshold_config, 'single_range')]
+        elif threshold_config["type"] == "multiple_ranges":
+            range_conditions = []
+            for range_config in threshold_config["ranges"]:
+                range_conditions.append((col, range_config, 'range'))
+            return range_conditions
+        elif threshold_config["type"] == "multiple_before":
+            before_conditions = []
+            for date in threshold_config["dates"]:
+                before_conditions.append((col, date, 'before'))
+            return before_conditions
+        elif threshold_config["type"] == "multiple_after":
+            after_conditions = []
+            for date in threshold_config["dates"]:
+                after_conditions.append((col, date, 'after'))
+            return after_conditions
+        elif threshold_config["type"] == "multiple_on":
+            on_conditions = []
+            for date in threshold_config["dates"]:
+                on_conditions.append((col, date, 'on'))
+            return on_conditions
+        elif threshold_config["type"] == "multiple_last_n_days":
+            last_n_conditions = []
+            for config in threshold_config["configs"]:
+                last_n_conditions.append((col, config, 'last_n_days'))
+            return last_n_conditions
+        elif threshold_config["type"] == "multiple_first_n_days":
+            first_n_conditions = []
+            for config in threshold_config["configs"]:
+                first_n_conditions.append((col, config, 'first_n_days'))
+            return first_n_conditions
+        return None
+    
+    if kind == 'numeric':
+        if threshold_config["type"] == "range":
+            # For range: create conditions for each range
+            range_conditions = []
+            total_ranges = len(threshold_config["ranges"])
+            for i, (start, end) in enumerate(threshold_config["ranges"]):
+                range_conditions.append(
+                    (col, {"start": start, "end": end, "range_id": i+1, "total_ranges": total_ranges,
+                           "upper": _range_upper_bound(end, i + 1 == total_ranges)}, 'range')
+                )
+            return range_conditions
+        elif threshold_config["type"] == "multiple_greater_than":
+            # Create conditions for each greater than value
+            return [(col, value, '>') for value in threshold_config["values"]]
+        elif threshold_config["type"] == "multiple_less_than":
+            return [(col, value, '<') for value in threshold_config["values"]]
+        elif threshold_config["type"] == "multiple_conditions_or":
+            # Create individual conditions AND the combined OR condition
+            individual_conditions = []
+            for condition in threshold_config["conditions"]:
+                # Each individual condition as a single tuple
+                individual_conditions.append(
+                    (col, condition["value"], condition["operator"])
+                )
+            
+            # Add the combined OR condition as well (as a list of tuples)
+            or_condition_group = []
+            for condition in threshold_config["conditions"]:
+                or_condition_group.append(
+                    (col, condition["value"], condition["operator"])
+                )
+            individual_conditions.append(or_condition_group)
+            
+            return individual_conditions
+        else:  # mean, median, custom
+            # For traditional thresholds: both >= and < conditions
+            return [
+                (col, threshold_config["value"], '>='),
+                (col, threshold_config["value"], '<')
+            ]
+    
+    # For categorical: include condition with multiple value groups
+    if threshold_config["type"] == "categorical" and threshold_config["value_groups"]:
+        group_conditions = []
+        for group in threshold_config["value_groups"]:
+            if group:  # Only if group has values
+                group_conditions.append(
+                    (col, group, 'include')
+                )
+        return group_conditions
+    return None
+
+def _evaluate_condition(condition_item, df, column_kinds, dt_cache, np_cache, code_cache):
+    """
+    Evaluate a single condition from analyze_data_combinations against the full frame.
+    
+    Args:
+        condition_item: (column, threshold data, operator) tuple, or a list of such
+            tuples for an OR condition group
+        df (pd.DataFrame): Data being analyzed
+        column_kinds (dict): Column kind per column, from _column_kind
+        dt_cache (dict): Parsed datetime64 arrays per date column
+        np_cache (dict): Float arrays per numeric column
+        code_cache (dict): (codes, distinct values) per categorical column, from pd.factorize
+    
+    Returns:
+        tuple: (column, mask or None if the condition filters nothing, matching row count,
+        description or None if the column stays blank, whether the condition is valid)
+    """
+    # Handle OR logic conditions (list of conditions)
+    if isinstance(condition_item, list) and len(condition_item) > 0 and isinstance(condition_item[0], tuple):
+        # This is an OR condition group
+        col = condition_item[0][0]  # Get column from first condition
+        
+        if column_kinds[col] != 'numeric':
+            return col, None, len(df), None, True
+        
+        # Handle multiple conditions with OR logic. Comparisons sharing an operator
+        # collapse to their loosest bound (x > 1 OR x > 3 is x > 1), so at most one
+        # array comparison per operator is needed before a single OR reduction.
+        loosest = {}
+        condition_descriptions = []
+        
+        for sub_col, sub_value, sub_operator in condition_item:
+            if sub_operator not in _OR_COMPARISONS:
+                continue
+            pick = min if sub_operator in ('>', '>=') else max
+            loosest[sub_operator] = pick(loosest.get(sub_operator, sub_value), sub_value)
+            condition_descriptions.append(f"{sub_col} {sub_operator} {sub_value:.2f}")
+        
+        col_values = np_cache[col]
+        if loosest:
+            or_mask = np.logical_or.reduce([_OR_COMPARISONS[op](col_values, value) for op, value in loosest.items()])
+        else:
+            or_mask = np.zeros(len(df), dtype=bool)
+        
+        return col, or_mask, int(np.count_nonzero(or_mask)), f"({' OR '.join(condition_descriptions)})", True
+    
+    # Handle regular conditions (single tuple)
+    col, threshold_data, operator = condition_item
+    mask = None
+    description = None
+    
+    kind = column_kinds[col]
+    
+    if kind == 'date':
+        if operator in ['single_range', 'range', 'before', 'after', 'on',
+                        'last_n_days', 'first_n_days']:
+            mask = date_condition_mask(dt_cache[col], threshold_data, operator)
+            description = generate_date_condition_description(col, threshold_data, operator)
+
+    elif kind == 'numeric':
         if operator == 'range':
-            start = threshold_config["start"]
-            end = threshold_config["end"]
-            range_id = threshold_config["range_id"]
-            total_ranges = threshold_config.get("total_ranges", 1)
-            # For last range, include the end value
-            if range_id == total_ranges:
-                return df[(df[column] >= start) & (df[column] <= end)]
-            else:
-                return df[(df[column] >= start) & (df[column] < end)]
-        elif operator == '>':
-            return df[df[column] > threshold_config]
-        elif operator == '<':
-            return df[df[column] < threshold_config]
+            start = threshold_data["start"]
+            end = threshold_data["end"]
+            range_id = threshold_data["range_id"]
+            total_ranges = threshold_data["total_ranges"]
+            
+            # Apply range condition: >= start and < end (except for last range which
+            # includes end, via an upper bound just above it), with no branch per range
+            mask = (np_cache[col] >= start) & (np_cache[col] < threshold_data["upper"])
+            description = _range_description(col, start, end, range_id == total_ranges)
+        elif isinstance(operator, list):
+            # This should not happen anymore as OR logic is handled above
+            pass
         elif operator == '>=':
-            return df[df[column] >= threshold_config]
-        elif operator == '<=':
-            return df[df[column] <= threshold_config]
+            mask = np_cache[col] >= threshold_data
+            description = f"{col} >= {threshold_data:.2f}"
+        elif operator == '<':
+            mask = np_cache[col] < threshold_data
+            description = f"{col} < {threshold_data:.2f}"
+        elif operator == '>':
+            mask = np_cache[col] > threshold_data
+            description = f"{col} > {threshold_data:.2f}"
     else:
-        if operator == 'include':
-            return df[df[column].isin(threshold_config)]
-        elif operator == 'exclude':
-            return df[~df[column].isin(threshold_config)]
+        if operator == 'include' and threshold_data:  # Only if values selected
+            if any(pd.isna(value) for value in threshold_data):
+                # Missing-value matching follows isin's dtype-specific rules
+                mask = df[col].isin(threshold_data).to_numpy(dtype=bool, na_value=False)
+            else:
+                mask = _code_mask(*code_cache[col], threshold_data)
+            # Format the values list nicely
+            if len(threshold_data) == 1:
+                description = f"{col} = {threshold_data[0]}"
+            elif len(threshold_data) <= 3:
+                description = f"{col} in [{', '.join(map(str, threshold_data))}]"
+            else:
+                description = f"{col} in [{', '.join(map(str, threshold_data[:3]))}...] ({len(threshold_data)} values)"
+        elif not threshold_data:
+            return col, None, 0, None, False
+    
+    count = len(df) if mask is None else int(np.count_nonzero(mask))
+    return col, mask, count, description, True
+
+def _range_upper_bound(end, is_last):
+    """
+    Exclusive upper bound of a numeric range, so every range filters with the same
+    `start <= x < upper` test: the last range includes its end, and for floats
+    x <= end is exactly x < nextafter(end, inf).
+    """
+    if is_last:
+        return np.nextafter(float(end), np.inf)
+    return end
+
+def _range_description(col, start, end, is_last):
+    """Describe a numeric range condition; only the last range includes its end"""
+    closing = "]" if is_last else ")"
+    return f"{col}: [{start:.2f} to {end:.2f}{closing}"
+
+def _range_bin_codes(values, ranges):
+    """
+    Label each value with the index of the numeric range containing it, using one
+    binary search over the range edges. Ranges are [start, end) except the last,
+    which is [start, end].
+    
+    Args:
+        values (np.ndarray): Float column values (NaN for missing)
+        ranges (list): (start, end) pairs
+    
+    Returns:
+        np.ndarray or None: Range index per value (-1 if none), or None if the
+        ranges are not contiguous and ascending
+    """
+    if not ranges:
+        return None
+    for (start, end), (next_start, _) in zip(ranges, ranges[1:]):
+        if start > end or end != next_start:
+            return None
+    if ranges[-1][0] > ranges[-1][1]:
+        return None
+    
+    edges = np.array([start for start, _ in ranges] + [ranges[-1][1]], dtype=float)
+    codes = np.searchsorted(edges, values, side='right') - 1
+    # The last range is closed on the right
+    codes[values == edges[-1]] = len(ranges) - 1
+    # Below the first edge, above the last or NaN
+    codes[(codes < 0) | (codes >= len(ranges))] = -1
+    return codes.astype(np.int64)
+
+def _partition_codes(evaluated, n_rows):
+    """
+    Label each row with the index of the one condition of a column it satisfies.
+    
+    Args:
+        evaluated (list): Evaluated conditions of one column, from _evaluate_condition
+        n_rows (int): Number of rows in the frame
+    
+    Returns:
+        np.ndarray or None: Condition index per row (-1 if none matches), or None if
+        a condition has no mask or two conditions can match the same row
+    """
+    codes = np.full(n_rows, -1, dtype=np.int64)
+    total = 0
+    for i, (_, cond_mask, count, _, _) in enumerate(evaluated):
+        if cond_mask is None:
+            return None
+        codes[cond_mask] = i
+        total += count
+    
+    # Overlapping conditions label fewer rows than they match between them
+    if int(np.count_nonzero(codes >= 0)) != total:
+        return None
+    return codes
+
+def _code_mask(codes, uniques, values):
+    """
+    Rows whose factorized value is one of `values`, matching Series.isin.
     
-    return df
+    Args:
+        codes (np.ndarray): Code per row from pd.factorize (-1 for missing)
+        uniques (pd.Index): Distinct values from pd.factorize
+        values (list): Values to match, none of them missing
+    
+    Returns:
+        np.ndarray: Boolean mask
+    """
+    # One extra trailing slot that stays False, looked up by missing values (code -1)
+    lookup = np.zeros(len(uniques) + 1, dtype=bool)
+    indexer = uniques.get_indexer(pd.Index(values).unique())
+    lookup[indexer[indexer >= 0]] = True
+    return lookup[codes]
+
+def _column_stats_loop(values):
+    """
+    Single-pass statistics of each row of `values`, skipping NaN.
+    Written as plain loops so Numba can compile it.
+    
+    Args:
+        values (np.ndarray): (K, N) float matrix of matched rows, one result column per row
+    
+    Returns:
+        np.ndarray: (K, 6) matrix of mean, sum, count, std (ddof=1), min, max
+    """
+    n_cols, n_rows = values.shape
+    out = np.full((n_cols, 6), np.nan)
+    
+    for k in range(n_cols):
+        total = 0.0
+        count = 0
+        lo = np.inf
+        hi = -np.inf
+        for i in range(n_rows):
+            v = values[k, i]
+            if not np.isnan(v):
+                total += v
+                count += 1
+                if v < lo:
+                    lo = v
+                if v > hi:
+                    hi = v
+        
+        out[k, 2] = count
+        if count > 0:
+            mean = total / count
+            out[k, 0] = mean
+            out[k, 1] = total
+            out[k, 4] = lo
+            out[k, 5] = hi
+            
+            # Second pass around the mean keeps the variance numerically stable
+            if count > 1:
+                squares = 0.0
+                for i in range(n_rows):
+                    v = values[k, i]
+                    if not np.isnan(v):
+                        squares += (v - mean) * (v - mean)
+                out[k, 3] = np.sqrt(squares / (count - 1))
+    
+    return out
+
+def _column_stats_numpy(values):
+    """
+    NumPy equivalent of _column_stats_loop, used when Numba is not installed.
+    NaN-aware reductions run over all result columns at once, using Bottleneck's
+    single-pass kernels when it is installed.
+    """
+    out = np.full((values.shape[0], 6), np.nan)
+    counts = np.count_nonzero(~np.isnan(values), axis=1)
+    out[:, 2] = counts
+    if values.shape[1] == 0:
+        return out
+    
+    nan_lib = bn if BOTTLENECK_AVAILABLE else np
+    with warnings.catch_warnings():
+        # All-NaN columns and single values are masked out below
+        warnings.simplefilter('ignore', RuntimeWarning)
+        out[:, 0] = nan_lib.nanmean(values, axis=1)
+        out[:, 1] = nan_lib.nansum(values, axis=1)
+        out[:, 3] = nan_lib.nanstd(values, axis=1, ddof=1)
+        out[:, 4] = nan_lib.nanmin(values, axis=1)
+        out[:, 5] = nan_lib.nanmax(values, axis=1)
+    
+    out[counts == 0, :2] = np.nan
+    out[counts == 0, 4:] = np.nan
+    out[counts < 2, 3] = np.nan
+    return out
+
+def _max_run_loop(values):
+    """
+    Longest run of equal consecutive values in a float array, in one scan.
+    NaN never extends a run. Written as a plain loop so Numba can compile it.
+    """
+    best = 0
+    current = 0
+    for i in range(values.shape[0]):
+        if i > 0 and values[i] == values[i - 1]:
+            current += 1
+        else:
+            current = 1
+        if current > best:
+            best = current
+    return best
 
+if NUMBA_AVAILABLE:
+    # nogil lets combinations running on worker threads use the kernels concurrently
+    column_stats = njit(cache=True, nogil=True)(_column_stats_loop)
+    float_max_run = njit(cache=True, nogil=True)(_max_run_loop)
+else:
+    column_stats = _column_stats_numpy
+    float_max_run = max_run_of_array
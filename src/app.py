@@ -1,10 +1,15 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from itertools import combinations, product
-from datetime import datetime, date
+import re
+import importlib.util
+from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
+from itertools import combinations, product, islice
+from datetime import datetime, date, timedelta
 from data_processor import load_and_process_data
-from analysis_engine import analyze_data_combinations, is_date_column, get_date_columns
+from analysis_engine import analyze_data_combinations, get_date_columns, invalidate_query_cache, median_of_array, calculate_max_run, datetime_values, sorted_date_values, date_condition_count
 from excel_handler import export_results
 from similarity_utils import add_similarity_columns
 import sys
@@ -16,14 +21,43 @@ from config import MAX_TOTAL_COMBINATIONS, calculate_max_ranges
 from src.utils.db import initialize_connection_pool, close_connection_pool, test_connection
 import atexit
 
-# Initialize connection pool when app starts
-try:
+# Optional: Arrow-backed strings for faster date parsing of text columns.
+# Only availability matters here (pandas loads pyarrow itself for the dtype),
+# so look the module up once instead of importing it
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+@st.cache_resource(show_spinner=False)
+def init_database_pool():
+    """
+    Initialize the connection pool once per server process. Streamlit reruns
+    this script on every interaction; cache_resource makes later reruns reuse
+    the pool and keeps the shutdown hook from being registered again.
+    A failed attempt is not cached, so the next rerun retries.
+    """
     initialize_connection_pool()
     # Register cleanup function to close pool on shutdown
     atexit.register(close_connection_pool)
+    return True
+
+# Initialize connection pool when app starts
+try:
+    init_database_pool()
 except Exception as e:
     st.warning(f"Database connection pool initialization failed: {e}. Database features will be unavailable.")
 
+def as_arrow_strings(values: pd.Series) -> pd.Series:
+    """
+    Convert an all-text object column to Arrow-backed strings (one contiguous
+    buffer instead of a Python object per row) before date parsing.
+    Columns holding anything other than strings, and environments without
+    pyarrow, get the values back unchanged.
+    """
+    if not PYARROW_AVAILABLE or values.dtype != object:
+        return values
+    if pd.api.types.infer_dtype(values, skipna=True) != 'string':
+        return values
+    return values.astype('string[pyarrow]')
+
 def parse_date_column(df: pd.DataFrame, column_name: str, date_format: str) -> tuple[pd.DataFrame, bool, str]:
     """
     Parse a date column with the specified format and convert to datetime.
@@ -32,22 +66,23 @@ def parse_date_column(df: pd.DataFrame, column_name: str, date_format: str) -> t
         tuple: (modified_dataframe, success_flag, error_message)
     """
     try:
-        df_copy = df.copy()
+        # Only the parsed column is new; the rest of the frame is shared via
+        # assign() on success instead of copying every column up front
+        col_values = as_arrow_strings(df[column_name])
         
-        # Handle different format specifications
         if date_format == "auto":
             # Try pandas automatic detection with errors='coerce'
-            df_copy[column_name] = pd.to_datetime(df_copy[column_name], errors='coerce')
+            new_col = pd.to_datetime(col_values, errors='coerce')
         elif date_format == "excel_serial":
             # Handle Excel serial date numbers
-            df_copy[column_name] = pd.to_datetime(df_copy[column_name], origin='1899-12-30', unit='D', errors='coerce')
+            new_col = pd.to_datetime(col_values, origin='1899-12-30', unit='D', errors='coerce')
         else:
             # Use specific format with errors='coerce'
-            df_copy[column_name] = pd.to_datetime(df_copy[column_name], format=date_format, errors='coerce')
+            new_col = pd.to_datetime(col_values, format=date_format, errors='coerce')
         
         # Check for any NaT values after conversion
-        nat_count = df_copy[column_name].isna().sum()
-        total_count = len(df_copy)
+        nat_count = new_col.isna().sum()
+        total_count = len(df)
         original_na_count = df[column_name].isna().sum()
         
         # Calculate actual parsing failures (excluding original NAs)
@@ -57,9 +92,9 @@ def parse_date_column(df: pd.DataFrame, column_name: str, date_format: str) -> t
             return df, False, "All values failed to parse. Please check the date format."
         elif parsing_failures > 0:
             success_rate = ((total_count - parsing_failures) / total_count) * 100
-            return df_copy, True, f"Parsed successfully with {success_rate:.1f}% success rate ({parsing_failures} values failed to parse)"
+            return df.assign(**{column_name: new_col}), True, f"Parsed successfully with {success_rate:.1f}% success rate ({parsing_failures} values failed to parse)"
         else:
-            return df_copy, True, "All dates parsed successfully!"
+            return df.assign(**{column_name: new_col}), True, "All dates parsed successfully!"
             
     except Exception as e:
         return df, False, f"Parsing failed: {str(e)}"
@@ -77,12 +112,11 @@ def parse_date_column_multi_format(df: pd.DataFrame, column_name: str, date_form
         tuple: (modified_dataframe, success_flag, detailed_message)
     """
     try:
-        df_copy = df.copy()
-        original_values = df_copy[column_name].copy()
+        # Read the column directly; the frame itself is only rebuilt (via
+        # assign) once the parsed values are ready
+        original_values = as_arrow_strings(df[column_name])
         original_na_count = original_values.isna().sum()
         
-        # Initialize with NaT
-        parsed_values = pd.Series([pd.NaT] * len(df_copy), index=df_copy.index)
         format_success_counts = {}
         
         # Get non-null values to work with
@@ -92,59 +126,75 @@ def parse_date_column_multi_format(df: pd.DataFrame, column_name: str, date_form
         if len(values_to_parse) == 0:
             return df, False, "No non-null values to parse"
         
+        # Date columns repeat the same strings a lot, so each distinct value
+        # is parsed once; value_codes maps rows back to their unique value and
+        # unique_counts turns per-format tallies back into row counts
+        value_codes, unique_values = pd.factorize(values_to_parse)
+        unique_values = pd.Series(unique_values)
+        unique_counts = np.bincount(value_codes, minlength=len(unique_values))
+        
+        # Parsed values live in a plain datetime64[ns] array written with NumPy
+        # fancy indexing, avoiding pandas index alignment on every format
+        parsed_uniques = np.full(len(unique_values), np.datetime64('NaT'), dtype='datetime64[ns]')
+        
+        # Numbers mixed into a text column are only read as Excel serials; the
+        # text formats would take them as epoch nanoseconds
+        if unique_values.dtype == object:
+            numeric_uniques = unique_values.map(pd.api.types.is_number).to_numpy(dtype=bool)
+        else:
+            numeric_uniques = np.zeros(len(unique_values), dtype=bool)
+        
         # Try each format
         for date_format in date_formats:
             # Skip values that are already successfully parsed
-            remaining_mask = non_null_mask & parsed_values.isna()
-            remaining_values = original_values[remaining_mask]
+            remaining_positions = np.flatnonzero(np.isnat(parsed_uniques))
+            
+            # Every value is parsed already, so later formats have nothing to do
+            if len(remaining_positions) == 0:
+                break
+            
+            remaining_values = unique_values.iloc[remaining_positions]
             
-            if len(remaining_values) == 0:
-                continue
-                
             format_success_counts[date_format] = 0
             
-            if date_format == "auto":
-                # Try pandas automatic detection
-                try:
-                    temp_parsed = pd.to_datetime(remaining_values, errors='coerce')
-                    success_mask = ~temp_parsed.isna()
-                    parsed_values.loc[remaining_mask & success_mask] = temp_parsed[success_mask]
-                    format_success_counts[date_format] = success_mask.sum()
-                except:
-                    continue
+            try:
+                if date_format == "auto":
+                    # Try pandas automatic detection on the non-numeric values
+                    text_mask = ~numeric_uniques[remaining_positions]
+                    remaining_positions = remaining_positions[text_mask]
+                    temp_parsed = pd.to_datetime(remaining_values[text_mask], errors='coerce')
                     
-            elif date_format == "excel_serial":
-                # Handle Excel serial date numbers
-                try:
-                    # Only try this for numeric values
-                    numeric_mask = pd.to_numeric(remaining_values, errors='coerce').notna()
-                    if numeric_mask.any():
-                        numeric_values = remaining_values[numeric_mask]
-                        temp_parsed = pd.to_datetime(numeric_values, origin='1899-12-30', unit='D', errors='coerce')
-                        success_mask = ~temp_parsed.isna()
-                        
-                        # Map back to original indices
-                        remaining_numeric_indices = remaining_values[numeric_mask].index
-                        parsed_values.loc[remaining_numeric_indices[success_mask]] = temp_parsed[success_mask]
-                        format_success_counts[date_format] = success_mask.sum()
-                except:
-                    continue
+                elif date_format == "excel_serial":
+                    # Handle Excel serial date numbers - only try this for numeric values
+                    numeric_mask = pd.to_numeric(remaining_values, errors='coerce').notna().to_numpy()
+                    remaining_positions = remaining_positions[numeric_mask]
+                    temp_parsed = pd.to_datetime(remaining_values[numeric_mask], origin='1899-12-30', unit='D', errors='coerce')
                     
-            else:
-                # Use specific format
-                try:
-                    temp_parsed = pd.to_datetime(remaining_values, format=date_format, errors='coerce')
-                    success_mask = ~temp_parsed.isna()
-                    parsed_values.loc[remaining_mask & success_mask] = temp_parsed[success_mask]
-                    format_success_counts[date_format] = success_mask.sum()
-                except:
-                    continue
+                else:
+                    # Use specific format on the non-numeric values
+                    text_mask = ~numeric_uniques[remaining_positions]
+                    remaining_positions = remaining_positions[text_mask]
+                    temp_parsed = pd.to_datetime(remaining_values[text_mask], format=date_format, errors='coerce')
+                
+                # as_unit raises for dates outside the nanosecond range instead of
+                # letting a raw NumPy cast wrap them around
+                temp_values = temp_parsed.dt.as_unit('ns').to_numpy()
+                success_mask = ~np.isnat(temp_values)
+                
+                # Write back to the unique value positions
+                parsed_positions = remaining_positions[success_mask]
+                parsed_uniques[parsed_positions] = temp_values[success_mask]
+                format_success_counts[date_format] = unique_counts[parsed_positions].sum()
+            except:
+                continue
         
-        # Update the dataframe
-        df_copy[column_name] = parsed_values
+        # Broadcast the parsed unique values back onto the rows
+        row_values = np.full(len(df), np.datetime64('NaT'), dtype='datetime64[ns]')
+        row_values[non_null_mask.to_numpy()] = parsed_uniques[value_codes]
+        parsed_values = pd.Series(row_values, index=df.index)
         
         # Calculate success statistics
-        total_count = len(df_copy)
+        total_count = len(df)
         final_na_count = parsed_values.isna().sum()
         parsing_failures = final_na_count - original_na_count
         successfully_parsed = total_count - final_na_count
@@ -161,8 +211,10 @@ def parse_date_column_multi_format(df: pd.DataFrame, column_name: str, date_form
                 return df, False, f"All parsed values resulted in the same date ({valid_parsed.iloc[0]}). This column likely does not contain dates."
             
             # Check if most dates are 1970-01-01 (Unix epoch - indicates numeric values being misinterpreted)
+            # (compared by day: small numbers read as epoch offsets land on 1970-01-01
+            # with a sub-day time part)
             epoch_date = pd.Timestamp('1970-01-01')
-            epoch_count = (valid_parsed == epoch_date).sum()
+            epoch_count = (valid_parsed.dt.normalize() == epoch_date).sum()
             if epoch_count / len(valid_parsed) > 0.5:
                 return df, False, f"Most parsed dates are 1970-01-01 (Unix epoch). This column contains numeric values, not dates."
         
@@ -191,17 +243,205 @@ def parse_date_column_multi_format(df: pd.DataFrame, column_name: str, date_form
             message_parts.append(f"\n{parsing_failures} values failed to parse")
         
         # Consider parsing as failed if success rate is too low
+        # Update the dataframe with the parsed column only
+        df_parsed = df.assign(**{column_name: parsed_values})
+        
         if success_rate < 50:
-            return df_copy, False, "\n".join(message_parts)
+            return df_parsed, False, "\n".join(message_parts)
             
-        return df_copy, True, "\n".join(message_parts)
+        return df_parsed, True, "\n".join(message_parts)
         
     except Exception as e:
         return df, False, f"Parsing failed with error: {str(e)}"
 
+def parse_date_column_cached(df: pd.DataFrame, table_name, column_name: str, date_formats) -> tuple[pd.DataFrame, bool, str]:
+    """
+    parse_date_column / parse_date_column_multi_format memoized in
+    st.session_state, so parsing the same column with the same format(s) again
+    (e.g. testing, switching strategy and back, then applying) does not
+    re-parse it.
+    
+    Only the resulting column is cached and re-attached to the current df, since
+    other columns may have been parsed in the meantime. The key includes the
+    dataset (table name and upload id) and the column's current dtype.
+    
+    Args:
+        df: DataFrame containing the column
+        table_name: Table the data was loaded into (part of the cache key)
+        column_name: Name of the column to parse
+        date_formats: A single format string (parse_date_column) or a list of
+            formats to try in order (parse_date_column_multi_format)
+    
+    Returns:
+        tuple: (modified_dataframe, success_flag, detailed_message)
+    """
+    single_format = isinstance(date_formats, str)
+    cache = st.session_state.setdefault('date_parse_cache', {})
+    cache_key = (
+        table_name,
+        st.session_state.get('last_uploaded_file_id'),
+        column_name,
+        str(df[column_name].dtype),
+        date_formats if single_format else tuple(date_formats)
+    )
+    
+    if cache_key not in cache:
+        if single_format:
+            parsed_df, success, message = parse_date_column(df, column_name, date_formats)
+        else:
+            parsed_df, success, message = parse_date_column_multi_format(df, column_name, date_formats)
+        cache[cache_key] = (parsed_df[column_name], success, message)
+    
+    parsed_column, success, message = cache[cache_key]
+    return df.assign(**{column_name: parsed_column}), success, message
+
+def cached_datetime_values(df: pd.DataFrame, table_name, column_name: str) -> np.ndarray:
+    """
+    datetime_values for a column, kept in st.session_state so Streamlit reruns
+    (every widget change) do not re-parse the column.
+    
+    The key includes the dataset (table name and upload id) and the column's
+    current dtype, which changes when date parsing is applied to it.
+    
+    Returns:
+        np.ndarray: datetime64[ns] values (NaT where unparseable)
+    """
+    cache = st.session_state.setdefault('datetime_values_cache', {})
+    cache_key = (
+        table_name,
+        st.session_state.get('last_uploaded_file_id'),
+        column_name,
+        str(df[column_name].dtype)
+    )
+    
+    if cache_key not in cache:
+        cache[cache_key] = datetime_values(df[column_name])
+    return cache[cache_key]
+
+def cached_sorted_date_values(df: pd.DataFrame, table_name, column_name: str) -> tuple:
+    """
+    sorted_date_values for a column, kept in st.session_state under the same
+    key as cached_datetime_values, so the column is sorted once and every
+    record count after that is a binary search.
+    
+    Returns:
+        tuple: Sorted values for date_condition_count
+    """
+    cache = st.session_state.setdefault('sorted_date_values_cache', {})
+    cache_key = (
+        table_name,
+        st.session_state.get('last_uploaded_file_id'),
+        column_name,
+        str(df[column_name].dtype)
+    )
+    
+    if cache_key not in cache:
+        cache[cache_key] = sorted_date_values(cached_datetime_values(df, table_name, column_name))
+    return cache[cache_key]
+
+def cached_date_columns(df: pd.DataFrame, table_name) -> list:
+    """
+    get_date_columns for the current dataframe, kept in st.session_state so
+    reruns do not repeat the per-column sample parsing of is_date_column.
+    
+    The key includes the dataset (table name and upload id) and every column's
+    current dtype, so applying date parsing to a column refreshes the result.
+    
+    Returns:
+        list: Date column names in dataframe order (a fresh list each call)
+    """
+    cache = st.session_state.setdefault('date_columns_cache', {})
+    cache_key = (
+        table_name,
+        st.session_state.get('last_uploaded_file_id'),
+        tuple((col, str(dtype)) for col, dtype in df.dtypes.items())
+    )
+    
+    if cache_key not in cache:
+        cache[cache_key] = get_date_columns(df)
+    return list(cache[cache_key])
+
+def parse_preview_rows(original_values: pd.Series, parsed_values: pd.Series) -> pd.DataFrame:
+    """
+    Build the before/after rows shown after a date parsing test.
+    
+    Args:
+        original_values: Original (non-null) values to show
+        parsed_values: Parsed values for the same rows
+    
+    Returns:
+        pd.DataFrame: 'Original', 'Parsed' and 'Status' columns, one row per value
+    """
+    if pd.api.types.is_datetime64_any_dtype(parsed_values):
+        # One vectorized strftime for all rows instead of one call per value
+        parsed_ok = parsed_values.notna().to_numpy()
+        parsed_strs = parsed_values.dt.strftime('%Y-%m-%d %H:%M:%S').to_numpy()
+    else:
+        # The parser handed back the unconverted column, so nothing was parsed
+        parsed_ok = np.zeros(len(parsed_values), dtype=bool)
+        parsed_strs = parsed_values.to_numpy()
+    
+    # Build the table straight from arrays so st.table doesn't have to infer
+    # a frame from per-row dicts
+    return pd.DataFrame({
+        'Original': original_values.astype(str).to_numpy(),
+        'Parsed': np.where(parsed_ok, parsed_strs, "Failed to parse"),
+        'Status': np.where(parsed_ok, "✓ Success", "✗ Failed")
+    })
+
+def render_parse_preview(df: pd.DataFrame, test_df: pd.DataFrame, date_column: str):
+    """
+    Show the before/after table for a date parsing test: the first 10 non-null
+    values of the column next to their parsed result.
+    
+    Args:
+        df: Dataframe with the original column
+        test_df: Result of the parsing test (same rows, in the same order)
+        date_column: Column that was parsed
+    """
+    st.write("**Parsing Results (first 10 non-null values):**")
+    
+    # Get first 10 non-null original values by position (test_df keeps df's row order)
+    preview_positions = np.flatnonzero(df[date_column].notna().to_numpy())[:10]
+    
+    if len(preview_positions) > 0:
+        st.table(parse_preview_rows(
+            df[date_column].iloc[preview_positions],
+            test_df[date_column].iloc[preview_positions]
+        ))
+    else:
+        st.warning("No non-null values found in the column")
+
+# One alternation per sample shape, tried in order so the first matching branch
+# wins (same precedence as checking the shapes one after another):
+#   iso_date      - 10 characters with exactly two '-'
+#   iso_datetime  - 19 characters containing a space and a ':'
+#   ymd_slash     - exactly two '/', 4-character first part
+#   dmy_slash     - exactly two '/', 4-character last part
+#   serial        - only digits, '.' and '-' (range-checked separately)
+_DATE_SAMPLE_PATTERN = re.compile(
+    r"(?P<iso_date>(?=.{10}\Z)[^-]*-[^-]*-[^-]*)"
+    r"|(?P<iso_datetime>(?=.{19}\Z)(?=.* )(?=.*:).*)"
+    r"|(?P<ymd_slash>[^/]{4}/[^/]*/[^/]*)"
+    r"|(?P<dmy_slash>[^/]*/[^/]*/[^/]{4})"
+    r"|(?P<serial>[\d.-]*\d[\d.-]*)",
+    re.DOTALL
+)
+
+# Formats suggested by each branch of _DATE_SAMPLE_PATTERN
+_DATE_SAMPLE_FORMATS = {
+    "iso_date": ("%Y-%m-%d",),
+    "iso_datetime": ("%Y-%m-%d %H:%M:%S",),
+    "ymd_slash": ("%Y/%m/%d",),
+    "dmy_slash": ("%d/%m/%Y", "%m/%d/%Y"),
+    "serial": ("excel_serial",),
+}
+
+@st.cache_data(show_spinner=False)
 def get_auto_detected_date_formats(sample_values):
     """
-    Automatically detect potential date formats from sample values
+    Automatically detect potential date formats from sample values.
+    Cached per sample, so pass a hashable tuple of values rather than a Series.
     """
     formats_to_try = [
         "auto",  # pandas auto-detection first
@@ -227,52 +467,54 @@ def get_auto_detected_date_formats(sample_values):
     ]
     
     # Analyze sample values to suggest most likely formats
-    sample_strings = [str(val) for val in sample_values if pd.notna(val)]
+    # (each sample is converted and stripped once, and only the first 200
+    # non-null values are ever converted)
+    sample_strings = list(islice((str(val).strip() for val in sample_values if pd.notna(val)), 200))
     
-    suggested_formats = []
-    format_priority = {}
+    # Each distinct sample is classified once and weighted by how often it
+    # occurs (Counter keeps first-seen order, so ties rank as before)
+    sample_counts = Counter(sample_strings)
+    unique_strings = list(sample_counts)
     
-    for sample in sample_strings[:20]:  # Check first 20 samples
-        sample_str = str(sample).strip()
-        
-        # Check for common patterns
-        if len(sample_str) == 10 and sample_str.count('-') == 2:
-            format_priority["%Y-%m-%d"] = format_priority.get("%Y-%m-%d", 0) + 1
-        elif len(sample_str) == 19 and ' ' in sample_str and ':' in sample_str:
-            format_priority["%Y-%m-%d %H:%M:%S"] = format_priority.get("%Y-%m-%d %H:%M:%S", 0) + 1
-        elif sample_str.count('/') == 2:
-            if len(sample_str.split('/')[0]) == 4:
-                format_priority["%Y/%m/%d"] = format_priority.get("%Y/%m/%d", 0) + 1
-            elif len(sample_str.split('/')[2]) == 4:
-                format_priority["%d/%m/%Y"] = format_priority.get("%d/%m/%Y", 0) + 1
-                format_priority["%m/%d/%Y"] = format_priority.get("%m/%d/%Y", 0) + 1
-        elif sample_str.replace('.', '').replace('-', '').isdigit():
-            # Could be excel serial number
-            try:
-                num_val = float(sample_str)
-                if 1 <= num_val <= 100000:  # Reasonable range for excel serial dates
-                    format_priority["excel_serial"] = format_priority.get("excel_serial", 0) + 1
-            except:
-                pass
+    # Numeric value of every distinct sample in one vectorized pass (NaN where
+    # it is not a number), used for the excel serial range check below
+    sample_numbers = pd.to_numeric(pd.Series(unique_strings, dtype=object), errors='coerce').to_numpy(dtype=float)
     
-    # Sort by priority and add to suggested formats
-    sorted_formats = sorted(format_priority.items(), key=lambda x: x[1], reverse=True)
-    suggested_formats = [fmt for fmt, _ in sorted_formats]
+    format_priority = Counter()
     
-    # Always include auto detection first
-    if "auto" not in suggested_formats:
-        suggested_formats.insert(0, "auto")
+    for sample_str, sample_number in zip(unique_strings, sample_numbers):
+        # Classify the sample with a single match against the combined pattern
+        match = _DATE_SAMPLE_PATTERN.fullmatch(sample_str)
+        if match is None:
+            continue
+        
+        # Could be excel serial number - only within a reasonable range for excel
+        # serial dates (NaN, i.e. not actually a number, fails the check)
+        if match.lastgroup == "serial" and not 1 <= sample_number <= 100000:
+            continue
+        
+        for fmt in _DATE_SAMPLE_FORMATS[match.lastgroup]:
+            format_priority[fmt] += sample_counts[sample_str]
     
-    # Add remaining common formats
-    for fmt in formats_to_try:
-        if fmt not in suggested_formats:
-            suggested_formats.append(fmt)
+    # Auto detection first, then the most frequent formats (ties keep first-seen
+    # order), then the remaining common formats; dict.fromkeys drops repeats
+    suggested_formats = list(dict.fromkeys([
+        "auto",
+        *(fmt for fmt, _ in format_priority.most_common()),
+        *formats_to_try
+    ]))
     
     return suggested_formats
 
+@lru_cache(maxsize=1)
 def get_common_date_formats():
-    """Return common date format patterns"""
-    return {
+    """
+    Return common date format patterns.
+    
+    The mapping never changes, so it is built once and shared read-only
+    instead of going through st.cache_data's hash-and-copy on every rerun.
+    """
+    return MappingProxyType({
         "Auto Detection": "auto",
         "yyyy-mm-dd": "%Y-%m-%d",
         "dd/mm/yyyy": "%d/%m/%Y",
@@ -296,11 +538,36 @@ def get_common_date_formats():
         "mm/dd/yyyy hh:mm:ss": "%m/%d/%Y %H:%M:%S",
         "yyyy/mm/dd hh:mm:ss": "%Y/%m/%d %H:%M:%S",
         "Excel Serial Number": "excel_serial"
-    }
+    })
 
-def is_column_datetime_converted(df: pd.DataFrame, column_name: str) -> bool:
-    """Check if a column has been successfully converted to datetime"""
-    return pd.api.types.is_datetime64_any_dtype(df[column_name])
+@st.cache_data(show_spinner=False)
+def is_likely_date_column(data_key, column_name: str, column_dtype: str, _column_data: pd.Series) -> bool:
+    """
+    Check if column is likely to contain dates (not numeric data).
+    
+    Cached per (data_key, column_name, column_dtype) so Streamlit reruns do not
+    re-sample and re-parse every column; _column_data is not hashed.
+    
+    Args:
+        data_key: Identifies the loaded dataset (table name and upload id)
+        column_name: Name of the column
+        column_dtype: String form of the column dtype (changes once parsed as dates)
+        _column_data: The column values
+    
+    Returns:
+        bool: True if the column holds mostly non-numeric values
+    """
+    if pd.api.types.is_numeric_dtype(_column_data):
+        return False
+    # Check if column contains mostly numeric-like values
+    sample = _column_data.dropna().head(100)
+    if len(sample) == 0:
+        return False
+    # Try converting to numeric - if most values can be converted, it's numeric data
+    numeric_count = pd.to_numeric(sample, errors='coerce').notna().sum()
+    if numeric_count / len(sample) > 0.7:  # More than 70% are numeric
+        return False
+    return True
 
 def filter_dataframe_by_date(df: pd.DataFrame, column: str, filter_config: dict) -> pd.DataFrame:
     """
@@ -314,8 +581,10 @@ def filter_dataframe_by_date(df: pd.DataFrame, column: str, filter_config: dict)
     Returns:
         Filtered DataFrame
     """
-    df_copy = df.copy()
-    col_data = pd.to_datetime(df_copy[column])
+    # Date columns are normally converted already; only parse when they are not
+    col_data = df[column]
+    if not pd.api.types.is_datetime64_any_dtype(col_data):
+        col_data = pd.to_datetime(col_data)
     
     if filter_config["type"] == "range":
         start_date = pd.to_datetime(filter_config["start_date"])
@@ -328,12 +597,15 @@ def filter_dataframe_by_date(df: pd.DataFrame, column: str, filter_config: dict)
         target_date = pd.to_datetime(filter_config["date"])
         mask = col_data > target_date
     elif filter_config["type"] == "on":
+        # Compare at day precision on the datetime values themselves rather
+        # than building a Python date object per row
         target_date = pd.to_datetime(filter_config["date"])
-        mask = col_data.dt.date == target_date
+        mask = col_data.dt.normalize() == target_date.normalize()
     else:
-        return df_copy
+        return df
     
-    return df_copy[mask]
+    # Boolean indexing already returns a new frame, so no upfront copy is needed
+    return df[mask]
 
 def calculate_consistency(series: pd.Series) -> float:
     """
@@ -342,61 +614,36 @@ def calculate_consistency(series: pd.Series) -> float:
     """
     if series.empty:
         return 0.0
-    value_counts = series.value_counts(normalize=True)
-    return float(value_counts.iloc[0] * 100)  # percentage of most common value
+    # Only the largest count is needed: hash-factorize and bincount the codes
+    # instead of building and sorting the full value_counts Series
+    codes, _ = pd.factorize(series)
+    codes = codes[codes >= 0]  # missing values (-1) are not counted, as in value_counts
+    if codes.size == 0:
+        return 0.0
+    return float(np.bincount(codes).max() / codes.size * 100)  # percentage of most common value
 
-def calculate_max_run(series: pd.Series) -> int:
+def numeric_column_stats(series: pd.Series) -> dict:
     """
-    Calculates the longest consecutive run (streak) of the same value in the series.
-    Works for both numeric and categorical data.
+    Computes the summary statistics shown for a numeric column from a single
+    float array, instead of one pandas reduction (and NaN scan) per statistic.
+    Expects NaNs to have been dropped already.
     """
-    if series.empty:
-        return 0
-    
-    max_run = current_run = 1
-    prev_value = series.iloc[0]
-
-    for value in series.iloc[1:]:
-        if value == prev_value:
-            current_run += 1
-            max_run = max(max_run, current_run)
-        else:
-            current_run = 1
-        prev_value = value
-
-    return max_run
+    values = series.to_numpy(dtype=np.float64)
+    n = values.size
+    if n == 0:
+        return {"min": np.nan, "max": np.nan, "mean": np.nan, "median": np.nan, "variance": np.nan, "count": 0}
 
-def add_similarity_columns(df: pd.DataFrame, group_by_cols: list, sum_cols: list) -> pd.DataFrame:
-    """
-    Adds per-row similarity counts and per-group sums to the DataFrame.
-
-    - similar_count: number of rows that share the same values for all columns in group_by_cols
-    - similar_sum_<col>: sum of <col> over the group defined by group_by_cols
-
-    If group_by_cols is empty, returns the original DataFrame.
-    """
-    if not group_by_cols:
-        return df
-
-    # work on a copy to avoid mutating original unintentionally
-    df = df.copy()
-
-    # Choose a stable column to count; using any column works since group size is same
-    try:
-        grouped = df.groupby(group_by_cols, dropna=False)
-    except Exception:
-        # fallback: if grouping fails (e.g., unhashable types), return original
-        return df
-
-    # similar_count
-    df["similar_count"] = grouped.transform("size").iloc[:, 0]
-
-    # similar sums for numeric sum_cols
-    for col in sum_cols:
-        if col in df.columns and pd.api.types.is_numeric_dtype(df[col]):
-            df[f"similar_sum_{col}"] = grouped[col].transform("sum")
-
-    return df
+    total = values.sum()
+    mean = total / n
+    return {
+        "min": values.min(),
+        "max": values.max(),
+        "mean": mean,
+        "median": median_of_array(values),
+        # Sample variance (ddof=1), matching Series.var()
+        "variance": ((values - mean) ** 2).sum() / (n - 1) if n > 1 else np.nan,
+        "count": n,
+    }
 
 st.set_page_config(
     page_title="Data Analysis Tool", 
@@ -648,6 +895,9 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
             
             df, table_name = load_and_process_data(uploaded_file, save_to_db=True)
             
+            # The table may have been replaced, so cached query results are stale
+            invalidate_query_cache()
+            
             progress_bar.progress(90)
             status_text.text("Finalizing...")
             
@@ -655,6 +905,10 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
             st.session_state.parsed_df = df.copy()
             st.session_state.table_name = table_name
             st.session_state.last_uploaded_file_id = current_file_id
+            st.session_state.date_parse_cache = {}
+            st.session_state.datetime_values_cache = {}
+            st.session_state.sorted_date_values_cache = {}
+            st.session_state.date_columns_cache = {}
             
             progress_bar.progress(100)
             status_text.empty()
@@ -679,6 +933,10 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                 st.session_state.original_df = None
                 st.session_state.table_name = None
                 st.session_state.date_columns_config = {}
+                st.session_state.date_parse_cache = {}
+                st.session_state.datetime_values_cache = {}
+                st.session_state.sorted_date_values_cache = {}
+                st.session_state.date_columns_cache = {}
                 if 'restored_config' in st.session_state:
                     del st.session_state.restored_config
                 if 'data_source' in st.session_state:
@@ -693,21 +951,16 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
     if configure_dates:
         with st.expander("Date Column Configuration", expanded=True):
             # Filter out numeric columns - only show text/object columns that could be dates
-            def is_likely_date_column(col):
-                """Check if column is likely to contain dates (not numeric data)"""
-                if pd.api.types.is_numeric_dtype(df[col]):
-                    return False
-                # Check if column contains mostly numeric-like values
-                sample = df[col].dropna().head(100)
-                if len(sample) == 0:
-                    return False
-                # Try converting to numeric - if most values can be converted, it's numeric data
-                numeric_count = pd.to_numeric(sample, errors='coerce').notna().sum()
-                if numeric_count / len(sample) > 0.7:  # More than 70% are numeric
-                    return False
-                return True
-            
-            non_numeric_columns = [col for col in df.columns if is_likely_date_column(col)]
+            # (the per-column check is cached per dataset, so reruns skip the sampling)
+            # Numeric and already-parsed datetime/timedelta dtypes (which convert to
+            # numbers) are dropped in one select_dtypes pass; only the remaining
+            # candidates need the sampled numeric-like check
+            data_key = (table_name, st.session_state.last_uploaded_file_id)
+            candidate_columns = df.select_dtypes(exclude=['number', 'datetime', 'datetimetz', 'timedelta']).columns
+            non_numeric_columns = [
+                col for col in candidate_columns
+                if is_likely_date_column(data_key, col, str(df[col].dtype), df[col])
+            ]
             
             if not non_numeric_columns:
                 st.warning("No text columns found. Date columns should contain text like '2024-01-15', not numbers.")
@@ -721,11 +974,15 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
             if date_column:
                 # Show sample data
                 st.write("**Sample data from selected column:**")
-                sample_data = df[date_column].dropna().head(10)
+                non_null_values = df[date_column].dropna()
+                sample_data = non_null_values.head(10)
                 st.write(sample_data.tolist())
                 
-                # Auto-detect potential formats
-                suggested_formats = get_auto_detected_date_formats(sample_data)
+                # Auto-detect potential formats from up to 200 distinct values taken
+                # from the first 5000 non-null rows, so repeated values don't crowd
+                # out other shapes (cached per sample, so widget reruns skip the scan)
+                detection_sample = pd.unique(non_null_values.head(5000).to_numpy())[:200]
+                suggested_formats = get_auto_detected_date_formats(tuple(detection_sample.tolist()))
                 
                 # Date format selection with auto-suggestions
                 st.write("**Parsing Strategy:**")
@@ -744,7 +1001,7 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                     # Test parsing button
                     if st.button("Test Multi-Format Parsing", type="secondary"):
                         with st.spinner("Testing multi-format date parsing..."):
-                            test_df, success, message = parse_date_column_multi_format(df, date_column, selected_formats)
+                            test_df, success, message = parse_date_column_cached(df, table_name, date_column, selected_formats)
                             
                             if success:
                                 st.success("Multi-format parsing successful!")
@@ -754,34 +1011,7 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                                 st.text(message)
                                 
                             # Show before/after comparison (regardless of success/failure)
-                            st.write("**Parsing Results (first 10 non-null values):**")
-                            
-                            # Get first 10 non-null original values
-                            original_non_null = df[date_column].dropna().head(10)
-                            
-                            if len(original_non_null) > 0:
-                                # Create a comparison table
-                                comparison_data = []
-                                for idx in original_non_null.index:
-                                    original_val = df.loc[idx, date_column]
-                                    parsed_val = test_df.loc[idx, date_column]
-                                    
-                                    if pd.notna(parsed_val):
-                                        parsed_str = parsed_val.strftime('%Y-%m-%d %H:%M:%S')
-                                        status = "✓ Success"
-                                    else:
-                                        parsed_str = "Failed to parse"
-                                        status = "✗ Failed"
-                                    
-                                    comparison_data.append({
-                                        'Original': str(original_val),
-                                        'Parsed': parsed_str,
-                                        'Status': status
-                                    })
-                                
-                                st.table(comparison_data)
-                            else:
-                                st.warning("No non-null values found in the column")
+                            render_parse_preview(df, test_df, date_column)
                                 
                             # Store test result if parsing was somewhat successful
                             if success:
@@ -828,40 +1058,13 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                     # Test parsing button
                     if st.button("Test Single Format Parsing", type="secondary"):
                         with st.spinner("Testing date parsing..."):
-                            test_df, success, message = parse_date_column(df, date_column, selected_format)
+                            test_df, success, message = parse_date_column_cached(df, table_name, date_column, selected_format)
                             
                             if success:
                                 st.success(message)
                                 
                                 # Show before/after comparison
-                                st.write("**Parsing Results (first 10 non-null values):**")
-                                
-                                # Get first 10 non-null original values
-                                original_non_null = df[date_column].dropna().head(10)
-                                
-                                if len(original_non_null) > 0:
-                                    # Create a comparison table
-                                    comparison_data = []
-                                    for idx in original_non_null.index:
-                                        original_val = df.loc[idx, date_column]
-                                        parsed_val = test_df.loc[idx, date_column]
-                                        
-                                        if pd.notna(parsed_val):
-                                            parsed_str = parsed_val.strftime('%Y-%m-%d %H:%M:%S')
-                                            status = "✓ Success"
-                                        else:
-                                            parsed_str = "Failed to parse"
-                                            status = "✗ Failed"
-                                        
-                                        comparison_data.append({
-                                            'Original': str(original_val),
-                                            'Parsed': parsed_str,
-                                            'Status': status
-                                        })
-                                    
-                                    st.table(comparison_data)
-                                else:
-                                    st.warning("No non-null values found in the column")
+                                render_parse_preview(df, test_df, date_column)
                                 
                                 st.session_state.test_result = {
                                     'column': date_column,
@@ -913,7 +1116,7 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                         # Test parsing button
                         if st.button("Test Multiple Format Parsing", type="secondary"):
                             with st.spinner("Testing multi-format date parsing..."):
-                                test_df, success, message = parse_date_column_multi_format(df, date_column, selected_formats)
+                                test_df, success, message = parse_date_column_cached(df, table_name, date_column, selected_formats)
                                 
                                 if success:
                                     st.success("Multi-format parsing successful!")
@@ -923,34 +1126,7 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                                     st.text(message)
                                     
                                 # Show before/after comparison (regardless of success/failure)
-                                st.write("**Parsing Results (first 10 non-null values):**")
-                                
-                                # Get first 10 non-null original values
-                                original_non_null = df[date_column].dropna().head(10)
-                                
-                                if len(original_non_null) > 0:
-                                    # Create a comparison table
-                                    comparison_data = []
-                                    for idx in original_non_null.index:
-                                        original_val = df.loc[idx, date_column]
-                                        parsed_val = test_df.loc[idx, date_column]
-                                        
-                                        if pd.notna(parsed_val):
-                                            parsed_str = parsed_val.strftime('%Y-%m-%d %H:%M:%S')
-                                            status = "✓ Success"
-                                        else:
-                                            parsed_str = "Failed to parse"
-                                            status = "✗ Failed"
-                                        
-                                        comparison_data.append({
-                                            'Original': str(original_val),
-                                            'Parsed': parsed_str,
-                                            'Status': status
-                                        })
-                                    
-                                    st.table(comparison_data)
-                                else:
-                                    st.warning("No non-null values found in the column")
+                                render_parse_preview(df, test_df, date_column)
                                     
                                 # Store test result if parsing was somewhat successful
                                 if success:
@@ -1000,13 +1176,16 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
     # Show column types for user reference
     with st.expander("Column Type Reference"):
         # Get date columns (both originally detected and manually configured)
-        date_cols = get_date_columns(df)
+        date_cols = cached_date_columns(df, table_name)
         for col, config in st.session_state.date_columns_config.items():
             if config.get('applied', False) and col not in date_cols:
                 date_cols.append(col)
         
-        numeric_cols = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
-        categorical_cols = [col for col in df.columns if col not in date_cols and col not in numeric_cols]
+        # One pass over df.dtypes (no Series built per column); set lookups for
+        # the categorical remainder
+        numeric_cols = [col for col, dtype in df.dtypes.items() if pd.api.types.is_numeric_dtype(dtype)]
+        non_categorical = set(date_cols).union(numeric_cols)
+        categorical_cols = [col for col in df.columns if col not in non_categorical]
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -1054,34 +1233,42 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
         st.markdown('<h2 class="section-header">Statistical Analysis & Threshold Configuration</h2>', unsafe_allow_html=True)
         thresholds = {}
         
+        # Detect date columns once for all the selected columns
+        detected_date_cols = set(cached_date_columns(df, table_name))
+        
         for col in selected_columns:
             with st.expander(f"Configure {col}"):
                 col_data = df[col].dropna()
                 
                 # Check if column is date/datetime - improved detection
+                # (detected date columns already include datetime-typed ones)
                 is_date_col = (
-                    is_date_column(df, col) or 
-                    is_column_datetime_converted(df, col) or
+                    col in detected_date_cols or
                     (col in st.session_state.date_columns_config and 
                      st.session_state.date_columns_config[col].get('applied', False))
                 )
                 
                 if is_date_col:
-                    # Ensure the column is properly converted to datetime
+                    # datetime64 values converted once per column (cached across reruns);
+                    # they feed the statistics, and their sorted copy the record counts
+                    # of the date widgets below
                     try:
-                        if not is_column_datetime_converted(df, col):
-                            # If not already datetime, try to convert
-                            col_data_dt = pd.to_datetime(col_data, errors='coerce')
-                        else:
-                            col_data_dt = col_data
+                        date_values = cached_datetime_values(df, table_name, col)
+                        # Sorted once so every record count is a binary search, not a full scan
+                        sorted_dates = cached_sorted_date_values(df, table_name, col)
                     except:
-                        col_data_dt = col_data
+                        date_values = None
+                        sorted_dates = None
                     
-                    # Show statistics for date columns
-                    valid_dates = col_data_dt.dropna()
-                    if len(valid_dates) > 0:
-                        min_date = valid_dates.min()
-                        max_date = valid_dates.max()
+                    # Show statistics for date columns, reduced straight from the
+                    # cached datetime64 values (NaT marks missing or unparseable rows)
+                    if date_values is not None:
+                        valid_values = date_values[~np.isnat(date_values)]
+                    else:
+                        valid_values = np.array([], dtype='datetime64[ns]')
+                    if len(valid_values) > 0:
+                        min_date = pd.Timestamp(valid_values.min())
+                        max_date = pd.Timestamp(valid_values.max())
                         date_range = max_date - min_date
                         
                         col1, col2, col3, col4 = st.columns(4)
@@ -1092,7 +1279,7 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                         with col3:
                             st.metric("Date Range", f"{date_range.days} days")
                         with col4:
-                            st.metric("Valid Dates", f"{len(valid_dates)}/{len(col_data)}")
+                            st.metric("Valid Dates", f"{len(valid_values)}/{len(col_data)}")
                         
                         # Date filtering method selection
                         date_method = st.selectbox(
@@ -1122,12 +1309,8 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                             
                             if start_date <= end_date:
                                 try:
-                                    if is_column_datetime_converted(df, col):
-                                        filtered_count = len(df[(df[col].dt.date >= start_date) & 
-                                                               (df[col].dt.date <= end_date)])
-                                    else:
-                                        filtered_count = len(df[(pd.to_datetime(df[col], errors='coerce').dt.date >= start_date) & 
-                                                               (pd.to_datetime(df[col], errors='coerce').dt.date <= end_date)])
+                                    filtered_count = date_condition_count(
+                                        sorted_dates, {"start_date": start_date, "end_date": end_date}, 'range')
                                     st.info(f"Range: {start_date} to {end_date} ({filtered_count} records)")
                                 except:
                                     st.info(f"Range: {start_date} to {end_date}")
@@ -1175,12 +1358,8 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                                 
                                 if start_date <= end_date:
                                     try:
-                                        if is_column_datetime_converted(df, col):
-                                            filtered_count = len(df[(df[col].dt.date >= start_date) & 
-                                                                   (df[col].dt.date <= end_date)])
-                                        else:
-                                            filtered_count = len(df[(pd.to_datetime(df[col], errors='coerce').dt.date >= start_date) & 
-                                                                   (pd.to_datetime(df[col], errors='coerce').dt.date <= end_date)])
+                                        filtered_count = date_condition_count(
+                                            sorted_dates, {"start_date": start_date, "end_date": end_date}, 'range')
                                         st.info(f"{start_date} to {end_date} ({filtered_count} records)")
                                     except:
                                         st.info(f"{start_date} to {end_date}")
@@ -1207,19 +1386,22 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                             )
                             
                             before_dates = []
+                            # Evenly spaced default dates, worked out once before the inputs
+                            first_date = min_date.date()
+                            default_dates = [
+                                first_date + timedelta(days=(i+1) * date_range.days // (num_dates + 1))
+                                for i in range(num_dates)
+                            ]
                             for i in range(num_dates):
                                 selected_date = st.date_input(
                                     f"Before date {i+1}",
-                                    value=min_date.date() + pd.Timedelta(days=(i+1) * date_range.days // (num_dates + 1)),
+                                    value=default_dates[i],
                                     min_value=min_date.date(),
                                     max_value=max_date.date(),
                                     key=f"before_date_{col}_{i}"
                                 )
                                 try:
-                                    if is_column_datetime_converted(df, col):
-                                        filtered_count = len(df[df[col].dt.date < selected_date])
-                                    else:
-                                        filtered_count = len(df[pd.to_datetime(df[col], errors='coerce').dt.date < selected_date])
+                                    filtered_count = date_condition_count(sorted_dates, selected_date, 'before')
                                     st.info(f"Before {selected_date} ({filtered_count} records)")
                                 except:
                                     st.info(f"Before {selected_date}")
@@ -1243,19 +1425,22 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                             )
                             
                             after_dates = []
+                            # Evenly spaced default dates, worked out once before the inputs
+                            first_date = min_date.date()
+                            default_dates = [
+                                first_date + timedelta(days=(i+1) * date_range.days // (num_dates + 1))
+                                for i in range(num_dates)
+                            ]
                             for i in range(num_dates):
                                 selected_date = st.date_input(
                                     f"After date {i+1}",
-                                    value=min_date.date() + pd.Timedelta(days=(i+1) * date_range.days // (num_dates + 1)),
+                                    value=default_dates[i],
                                     min_value=min_date.date(),
                                     max_value=max_date.date(),
                                     key=f"after_date_{col}_{i}"
                                 )
                                 try:
-                                    if is_column_datetime_converted(df, col):
-                                        filtered_count = len(df[df[col].dt.date > selected_date])
-                                    else:
-                                        filtered_count = len(df[pd.to_datetime(df[col], errors='coerce').dt.date > selected_date])
+                                    filtered_count = date_condition_count(sorted_dates, selected_date, 'after')
                                     st.info(f"After {selected_date} ({filtered_count} records)")
                                 except:
                                     st.info(f"After {selected_date}")
@@ -1279,19 +1464,22 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                             )
                             
                             on_dates = []
+                            # Evenly spaced default dates, worked out once before the inputs
+                            first_date = min_date.date()
+                            default_dates = [
+                                first_date + timedelta(days=(i+1) * date_range.days // (num_dates + 1))
+                                for i in range(num_dates)
+                            ]
                             for i in range(num_dates):
                                 selected_date = st.date_input(
                                     f"On date {i+1}",
-                                    value=min_date.date() + pd.Timedelta(days=(i+1) * date_range.days // (num_dates + 1)),
+                                    value=default_dates[i],
                                     min_value=min_date.date(),
                                     max_value=max_date.date(),
                                     key=f"on_date_{col}_{i}"
                                 )
                                 try:
-                                    if is_column_datetime_converted(df, col):
-                                        filtered_count = len(df[df[col].dt.date == selected_date])
-                                    else:
-                                        filtered_count = len(df[pd.to_datetime(df[col], errors='coerce').dt.date == selected_date])
+                                    filtered_count = date_condition_count(sorted_dates, selected_date, 'on')
                                     st.info(f"On {selected_date} ({filtered_count} records)")
                                 except:
                                     st.info(f"On {selected_date}")
@@ -1322,10 +1510,8 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                                 )
                                 cutoff_date = max_date - pd.Timedelta(days=n_days)
                                 try:
-                                    if is_column_datetime_converted(df, col):
-                                        filtered_count = len(df[df[col] >= cutoff_date])
-                                    else:
-                                        filtered_count = len(df[pd.to_datetime(df[col], errors='coerce') >= cutoff_date])
+                                    filtered_count = date_condition_count(
+                                        sorted_dates, {"cutoff_date": cutoff_date}, 'last_n_days')
                                     st.info(f"Last {n_days} days (from {cutoff_date.strftime('%Y-%m-%d')}) - {filtered_count} records")
                                 except:
                                     st.info(f"Last {n_days} days (from {cutoff_date.strftime('%Y-%m-%d')})")
@@ -1357,10 +1543,8 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                                 )
                                 cutoff_date = min_date + pd.Timedelta(days=n_days)
                                 try:
-                                    if is_column_datetime_converted(df, col):
-                                        filtered_count = len(df[df[col] <= cutoff_date])
-                                    else:
-                                        filtered_count = len(df[pd.to_datetime(df[col], errors='coerce') <= cutoff_date])
+                                    filtered_count = date_condition_count(
+                                        sorted_dates, {"cutoff_date": cutoff_date}, 'first_n_days')
                                     st.info(f"First {n_days} days (until {cutoff_date.strftime('%Y-%m-%d')}) - {filtered_count} records")
                                 except:
                                     st.info(f"First {n_days} days (until {cutoff_date.strftime('%Y-%m-%d')})")
@@ -1377,19 +1561,20 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                 # Check if column is numeric
                 elif pd.api.types.is_numeric_dtype(col_data):
                     # Show statistics for numeric columns
+                    stats = numeric_column_stats(col_data)
                     col1, col2, col3, col4, col5, col6, col7, col8 = st.columns(8)
                     with col1:
-                        st.metric("Min", f"{col_data.min():.2f}")
+                        st.metric("Min", f"{stats['min']:.2f}")
                     with col2:
-                        st.metric("Max", f"{col_data.max():.2f}")
+                        st.metric("Max", f"{stats['max']:.2f}")
                     with col3:
-                        st.metric("Mean", f"{col_data.mean():.2f}")
+                        st.metric("Mean", f"{stats['mean']:.2f}")
                     with col4:
-                        st.metric("Median", f"{col_data.median():.2f}")
+                        st.metric("Median", f"{stats['median']:.2f}")
                     with col5:
-                        st.metric("Count", len(col_data))
+                        st.metric("Count", stats['count'])
                     with col6:
-                        st.metric("Variance", f"{col_data.var():.2f}")
+                        st.metric("Variance", f"{stats['variance']:.2f}")
                     with col7:
                         st.metric("Consistency", f"{calculate_consistency(col_data):.2f}")
                     with col8:
@@ -1403,18 +1588,18 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                     )
                     
                     if threshold_type == "Mean":
-                        threshold_value = col_data.mean()
+                        threshold_value = stats['mean']
                         st.info(f"Threshold value: {threshold_value:.2f}")
                         thresholds[col] = {"type": "mean", "value": threshold_value}
                     elif threshold_type == "Median":
-                        threshold_value = col_data.median()
+                        threshold_value = stats['median']
                         st.info(f"Threshold value: {threshold_value:.2f}")
                         thresholds[col] = {"type": "median", "value": threshold_value}
                     elif threshold_type == "Custom":
                         # Round values to avoid floating-point precision errors
-                        min_val = float(col_data.min())
-                        max_val = float(col_data.max())
-                        mean_val = float(col_data.mean())
+                        min_val = float(stats['min'])
+                        max_val = float(stats['max'])
+                        mean_val = float(stats['mean'])
                         
                         # Ensure mean is within bounds (handle floating-point precision)
                         mean_val = max(min_val, min(mean_val, max_val))
@@ -1442,6 +1627,18 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                             key=f"num_conditions_{col}"
                         )
                         
+                        # Input bounds shared by every condition
+                        # Round values to avoid floating-point precision errors
+                        min_val = float(stats['min'])
+                        max_val = float(stats['max'])
+                        mean_val = float(stats['mean'])
+                        
+                        # Ensure mean is within bounds (handle floating-point precision)
+                        mean_val = max(min_val, min(mean_val, max_val))
+                        
+                        # Column values as one float array for all the previews below
+                        col_values = col_data.to_numpy(dtype=float)
+                        
                         conditions = []
                         for i in range(num_conditions):
                             st.write(f"**Condition {i+1}:**")
@@ -1455,14 +1652,6 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                                 )
                             
                             with col2:
-                                # Round values to avoid floating-point precision errors
-                                min_val = float(col_data.min())
-                                max_val = float(col_data.max())
-                                mean_val = float(col_data.mean())
-                                
-                                # Ensure mean is within bounds (handle floating-point precision)
-                                mean_val = max(min_val, min(mean_val, max_val))
-                                
                                 value = st.number_input(
                                     f"Value",
                                     min_value=min_val,
@@ -1487,13 +1676,13 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                             # Show preview
                             try:
                                 if operator_map[operator] == ">":
-                                    preview_count = len(col_data[col_data > value])
+                                    preview_count = int(np.count_nonzero(col_values > value))
                                 elif operator_map[operator] == "<":
-                                    preview_count = len(col_data[col_data < value])
+                                    preview_count = int(np.count_nonzero(col_values < value))
                                 elif operator_map[operator] == ">=":
-                                    preview_count = len(col_data[col_data >= value])
+                                    preview_count = int(np.count_nonzero(col_values >= value))
                                 elif operator_map[operator] == "<=":
-                                    preview_count = len(col_data[col_data <= value])
+                                    preview_count = int(np.count_nonzero(col_values <= value))
                                 
                                 st.info(f"{col} {operator_map[operator]} {value:.2f} → {preview_count} records")
                             except:
@@ -1501,18 +1690,18 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                         
                         # Show combined preview
                         try:
-                            combined_mask = pd.Series([False] * len(col_data), index=col_data.index)
+                            combined_mask = np.zeros(len(col_values), dtype=bool)
                             for condition in conditions:
                                 if condition["operator"] == ">":
-                                    combined_mask |= (col_data > condition["value"])
+                                    combined_mask |= (col_values > condition["value"])
                                 elif condition["operator"] == "<":
-                                    combined_mask |= (col_data < condition["value"])
+                                    combined_mask |= (col_values < condition["value"])
                                 elif condition["operator"] == ">=":
-                                    combined_mask |= (col_data >= condition["value"])
+                                    combined_mask |= (col_values >= condition["value"])
                                 elif condition["operator"] == "<=":
-                                    combined_mask |= (col_data <= condition["value"])
+                                    combined_mask |= (col_values <= condition["value"])
                             
-                            total_matching = combined_mask.sum()
+                            total_matching = int(combined_mask.sum())
                             st.success(f"**Combined (OR logic): {total_matching} records match any condition**")
                         except:
                             pass
@@ -1771,8 +1960,9 @@ if uploaded_file or st.session_state.get('parsed_df') is not None:
                             
                             # Determine column types for SQL generation
                             column_types = {}
+                            detected_date_cols = set(cached_date_columns(df, table_name))
                             for col in selected_columns:
-                                if is_date_column(df, col) or (col in st.session_state.date_columns_config and 
+                                if col in detected_date_cols or (col in st.session_state.date_columns_config and 
                                                                st.session_state.date_columns_config[col].get('applied', False)):
                                     column_types[col] = 'date'
                                 elif pd.api.types.is_numeric_dtype(df[col]):
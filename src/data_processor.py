@@ -54,6 +54,36 @@ def fetch_dataframe_from_db(query, params=None):
         return None
 
 
+def fetch_dataframes_from_db(queries):
+    """
+    Run several queries on a single pooled connection and return each result as a
+    pandas DataFrame, avoiding a pool checkout and commit per query.
+    
+    Args:
+        queries (list): SQL queries to execute, in order
+    
+    Returns:
+        list: One DataFrame per query (None for a query that failed)
+    """
+    frames = []
+    try:
+        with get_db_connection() as conn:
+            for query in queries:
+                try:
+                    frames.append(pd.read_sql_query(query, conn))
+                except Exception as e:
+                    print(f"Database DataFrame query error: {e}")
+                    # Clear the aborted transaction so the remaining queries can run
+                    conn.rollback()
+                    frames.append(None)
+    except Exception as e:
+        print(f"Database connection error: {e}")
+    
+    # Queries that never ran are reported as failed
+    frames.extend([None] * (len(queries) - len(frames)))
+    return frames
+
+
 def save_dataframe_to_db(df, table_name, if_exists='replace', index=False):
     """
     Save pandas DataFrame to PostgreSQL table using the FASTEST method.
@@ -13,65 +13,90 @@ def generate_sql_condition(column, threshold_config, column_type='numeric'):
     Returns:
         list: List of SQL condition strings
     """
+    return [sql_cond for sql_cond, _ in generate_sql_conditions_with_metadata(column, threshold_config, column_type)]
+
+
+def generate_sql_conditions_with_metadata(column, threshold_config, column_type='numeric'):
+    """
+    Generate SQL WHERE clause conditions for a single column, each paired with the
+    structured values it was built from, so callers never have to parse the SQL back.
+    
+    Args:
+        column (str): Column name
+        threshold_config (dict): Threshold configuration
+        column_type (str): 'numeric', 'date', or 'categorical'
+    
+    Returns:
+        list: List of (SQL condition string, metadata dict) tuples. The metadata 'op' is one of
+        'between', 'before', 'after', 'on', 'last_n_days', 'first_n_days' (dates), 'range',
+        '>', '<', '>=', '<=', '=', '!=', 'or' (numeric) or 'in' (categorical)
+    """
     conditions = []
     
     if column_type == 'date':
         if threshold_config["type"] == "single_range":
             start = threshold_config["start_date"]
             end = threshold_config["end_date"]
-            conditions.append(f"\"{column}\"::date BETWEEN '{start}' AND '{end}'")
+            conditions.append((f"\"{column}\"::date BETWEEN '{start}' AND '{end}'",
+                               {"op": "between", "start": start, "end": end}))
             
         elif threshold_config["type"] == "multiple_ranges":
             for range_config in threshold_config["ranges"]:
                 start = range_config["start_date"]
                 end = range_config["end_date"]
-                conditions.append(f"\"{column}\"::date BETWEEN '{start}' AND '{end}'")
+                conditions.append((f"\"{column}\"::date BETWEEN '{start}' AND '{end}'",
+                                   {"op": "between", "start": start, "end": end}))
                 
         elif threshold_config["type"] == "multiple_before":
             for date in threshold_config["dates"]:
-                conditions.append(f"\"{column}\"::date < '{date}'")
+                conditions.append((f"\"{column}\"::date < '{date}'", {"op": "before", "date": date}))
                 
         elif threshold_config["type"] == "multiple_after":
             for date in threshold_config["dates"]:
-                conditions.append(f"\"{column}\"::date > '{date}'")
+                conditions.append((f"\"{column}\"::date > '{date}'", {"op": "after", "date": date}))
                 
         elif threshold_config["type"] == "multiple_on":
             for date in threshold_config["dates"]:
-                conditions.append(f"\"{column}\"::date = '{date}'")
+                conditions.append((f"\"{column}\"::date = '{date}'", {"op": "on", "date": date}))
                 
         elif threshold_config["type"] == "multiple_last_n_days":
             for config in threshold_config["configs"]:
                 cutoff = config["cutoff_date"]
-                conditions.append(f"\"{column}\"::date >= '{cutoff}'")
+                conditions.append((f"\"{column}\"::date >= '{cutoff}'",
+                                   {"op": "last_n_days", "days": config.get("days"), "cutoff": cutoff}))
                 
         elif threshold_config["type"] == "multiple_first_n_days":
             for config in threshold_config["configs"]:
                 cutoff = config["cutoff_date"]
-                conditions.append(f"\"{column}\"::date <= '{cutoff}'")
+                conditions.append((f"\"{column}\"::date <= '{cutoff}'",
+                                   {"op": "first_n_days", "days": config.get("days"), "cutoff": cutoff}))
                 
     elif column_type == 'numeric':
         if threshold_config["type"] == "range":
             for i, (start, end) in enumerate(threshold_config["ranges"], 1):
                 if i == len(threshold_config["ranges"]):  # Last range includes end
-                    conditions.append(f"\"{column}\" >= {start} AND \"{column}\" <= {end}")
+                    conditions.append((f"\"{column}\" >= {start} AND \"{column}\" <= {end}",
+                                       {"op": "range", "start": start, "end": end, "include_end": True}))
                 else:
-                    conditions.append(f"\"{column}\" >= {start} AND \"{column}\" < {end}")
+                    conditions.append((f"\"{column}\" >= {start} AND \"{column}\" < {end}",
+                                       {"op": "range", "start": start, "end": end, "include_end": False}))
                     
         elif threshold_config["type"] == "multiple_conditions_or":
             # Individual conditions
             for condition in threshold_config["conditions"]:
                 op = condition["operator"]
                 val = condition["value"]
-                conditions.append(f"\"{column}\" {op} {val}")
+                conditions.append((f"\"{column}\" {op} {val}", {"op": op, "value": val}))
                 
             # Combined OR condition
             or_parts = [f"\"{column}\" {c['operator']} {c['value']}" for c in threshold_config["conditions"]]
-            conditions.append(f"({' OR '.join(or_parts)})")
+            conditions.append((f"({' OR '.join(or_parts)})",
+                               {"op": "or", "conditions": [(c["operator"], c["value"]) for c in threshold_config["conditions"]]}))
             
         else:  # mean, median, custom
             value = threshold_config["value"]
-            conditions.append(f"\"{column}\" >= {value}")
-            conditions.append(f"\"{column}\" < {value}")
+            conditions.append((f"\"{column}\" >= {value}", {"op": ">=", "value": value}))
+            conditions.append((f"\"{column}\" < {value}", {"op": "<", "value": value}))
             
     elif column_type == 'categorical':
         if threshold_config["type"] == "categorical" and threshold_config.get("value_groups"):
@@ -80,7 +105,7 @@ def generate_sql_condition(column, threshold_config, column_type='numeric'):
                     # Escape single quotes in values
                     escaped_values = [str(v).replace("'", "''") for v in group]
                     values_str = "', '".join(escaped_values)
-                    conditions.append(f"\"{column}\" IN ('{values_str}')")
+                    conditions.append((f"\"{column}\" IN ('{values_str}')", {"op": "in", "values": list(group)}))
     
     return conditions
 
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 
@@ -13,15 +14,20 @@ def add_similarity_columns(df: pd.DataFrame, group_by_cols: list, sum_cols: list
     if not group_by_cols:
         return df
 
-    df = df.copy()
+    # Only new columns are added, so a shallow copy keeps the caller's frame
+    # untouched without duplicating its data
+    df = df.copy(deep=False)
 
+    # One grouper reused for the count and every sum; sort=False skips sorting
+    # the group keys and observed=True ignores unused categorical levels
     try:
-        grouped = df.groupby(group_by_cols, dropna=False)
+        grouped = df.groupby(group_by_cols, dropna=False, sort=False, observed=True)
+        group_codes = grouped.ngroup().to_numpy()
     except Exception:
         return df
 
-    # similar_count
-    df["similar_count"] = grouped.transform("size").iloc[:, 0]
+    # similar_count: size of each row's group, gathered through its group code
+    df["similar_count"] = np.bincount(group_codes)[group_codes]
 
     # similar sums for numeric sum_cols
     for col in sum_cols: